@@ -3,13 +3,12 @@
 Punto de entrada principal para la simulación de logística de cerdos.
 """
 
-from src.utils.data_loader import DataLoader
-from src.models.Farm import Farm
-from src.models.Slaughterhouse import Slaughterhouse
-from src.models.Transport import Transport
-from src.utils.BiologicalDataManager import BiologicalDataManager
+import numpy as np
+
+from src.utils.bootstrap import build_domain_objects
 from src.simulation.Simulator import Simulator
 from src.utils.metrics import compute_global_kpis, compute_daily_kpis
+from src.utils.geo import haversine_matrix
 
 
 def main():
@@ -20,16 +19,14 @@ def main():
     print()
     
     print("1. Cargando datos...")
-    loader = DataLoader(data_dir="data")
-    
     try:
-        farms_df, slaughterhouses_df, transports_df = loader.load_all_data()
+        farms, slaughterhouses, transports, bio_manager = build_domain_objects("data")
         print("✓ Datos cargados exitosamente")
-        print(f"  - {len(farms_df)} granjas")
-        print(f"  - {len(slaughterhouses_df)} mataderos")
-        print(f"  - {len(transports_df)} tipos de transporte")
-        print(f"  - Datos de consumo: {len(loader.get_consumption_data())} semanas")
-        print(f"  - Datos de peso: {len(loader.get_weight_data())} semanas")
+        print(f"  - {len(farms)} granjas")
+        print(f"  - {len(slaughterhouses)} mataderos")
+        print(f"  - {len(transports)} tipos de transporte")
+        print(f"  - Datos de consumo: {len(bio_manager.consumption_df)} semanas")
+        print(f"  - Datos de peso: {len(bio_manager.weight_df)} semanas")
     except Exception as e:
         print(f"Error al cargar datos: {e}")
         return
@@ -37,70 +34,32 @@ def main():
     print()
     
     print("2. Inicializando granjas...")
-    farms = []
-    for _, row in farms_df.iterrows():
-        farm = Farm(
-            farm_id=str(row['farm_id']),
-            name=str(row['name']),
-            lat=float(row['lat']),
-            lon=float(row['lon']),
-            inventory_pigs=int(row['inventory_pigs']),
-            avg_weight_kg=float(row['avg_weight_kg']),
-            growth_rate_kg_per_week=float(row['growth_rate_kg_per_week']),
-            age_weeks=int(row['age_weeks']),
-            price_per_kg=float(row['price_per_kg']),
-            consumption_pigs=float(row['consumption_pigs']),
-            capacity=int(row['capacity'])
-        )
-        farms.append(farm)
-    
     print(f"✓ {len(farms)} granjas creadas")
-    for farm in farms[:3]:
-        print(f"  - {farm}")
+    if farms:
+        print("\n".join(f"  - {farm}" for farm in farms[:3]))
     if len(farms) > 3:
         print(f"  ... y {len(farms) - 3} más")
     
     print()
     
     print("3. Inicializando mataderos...")
-    slaughterhouses = []
-    for _, row in slaughterhouses_df.iterrows():
-        slaughterhouse = Slaughterhouse(
-            slaughterhouse_id=str(row['slaughterhouse_id']),
-            name=str(row['name']),
-            lat=float(row['lat']),
-            lon=float(row['lon']),
-            capacity_per_day=int(row['capacity_per_day']),
-            price_per_kg=float(row['price_per_kg']),
-            penalty_15_min=float(row['penalty_15_min']),
-            penalty_15_max=float(row['penalty_15_max']),
-            penalty_20_min=float(row['penalty_20_min']),
-            penalty_20_max=float(row['penalty_20_max'])
-        )
-        slaughterhouses.append(slaughterhouse)
-    
     print(f"✓ {len(slaughterhouses)} mataderos creados")
-    for sh in slaughterhouses:
-        print(f"  - {sh}")
+    if slaughterhouses:
+        print("\n".join(f"  - {sh}" for sh in slaughterhouses))
+    
+    # Matriz granja -> matadero, calculada una sola vez para toda la simulación.
+    distance_matrix = haversine_matrix(
+        np.array([f.lat for f in farms]), np.array([f.lon for f in farms]),
+        np.array([sh.lat for sh in slaughterhouses]), np.array([sh.lon for sh in slaughterhouses]),
+        dtype=np.float64,
+    )
     
     print()
     
     print("4. Inicializando transportes...")
-    transports = []
-    for _, row in transports_df.iterrows():
-        transport = Transport(
-            transport_id=str(row['transport_id']),
-            type=str(row['type']),
-            capacity_tons=float(row['capacity_tons']),
-            cost_per_km=float(row['cost_per_km']),
-            max_hours_per_week=float(row['max_hours_per_week']),
-            fixed_weekly_cost=float(row['fixed_weekly_cost'])
-        )
-        transports.append(transport)
-    
     print(f"✓ {len(transports)} tipos de transporte disponibles")
-    for t in transports:
-        print(f"  - {t}")
+    if transports:
+        print("\n".join(f"  - {t}" for t in transports))
     
     print()
     print("=" * 60)
@@ -108,10 +67,6 @@ def main():
     print("=" * 60)
     
     print("\n5. Cargando datos biológicos...")
-    bio_manager = BiologicalDataManager(
-        loader.get_consumption_data(),
-        loader.get_weight_data()
-    )
     print(f"✓ {bio_manager}")
     
     print("\nESTADÍSTICAS DE EJEMPLO (edad 16 semanas):")
@@ -122,11 +77,24 @@ def main():
     
     print()
     
+    # Se crea aquí para leer el total de cerdos de sus arrays SoA.
+    simulator = Simulator(
+        farms=farms,
+        slaughterhouses=slaughterhouses,
+        transports=transports,
+        biological_manager=bio_manager,
+        speed_kmh=60.0,
+        min_market_weight_kg=105.0,
+        max_stops_per_route=3,
+        max_hours_per_day=8.0,
+        distance_matrix=distance_matrix,
+    )
+    
     print("\nRESUMEN DE DATOS:")
     print(f"  Granjas: {len(farms)}")
     print(f"  Mataderos: {len(slaughterhouses)}")
     print(f"  Transportes: {len(transports)}")
-    print(f"  Total de cerdos en sistema: {sum(f.inventory_pigs for f in farms)}")
+    print(f"  Total de cerdos en sistema: {int(simulator.farm_arrays.inventory_pigs.sum())}")
     print()
     
     print("=" * 60)
@@ -137,17 +105,6 @@ def main():
         print("No hay suficientes entidades (granjas/mataderos/transportes) para simular.")
         return
 
-    simulator = Simulator(
-        farms=farms,
-        slaughterhouses=slaughterhouses,
-        transports=transports,
-        biological_manager=bio_manager,
-        speed_kmh=60.0,
-        min_market_weight_kg=105.0,
-        max_stops_per_route=3,
-        max_hours_per_day=8.0,
-    )
-
     DAYS_TO_SIMULATE = 10
     events = simulator.run(days=DAYS_TO_SIMULATE)
 
@@ -159,8 +116,7 @@ def main():
 
     print("\nKPIs GLOBALES (plan quinzenal):")
     kpis = compute_global_kpis(events)
-    for k, v in kpis.items():
-        print(f"  {k}: {v}")
+    print("\n".join(f"  {k}: {v}" for k, v in kpis.items()))
 
     print("\nKPIs POR DÍA:")
     daily = compute_daily_kpis(events)
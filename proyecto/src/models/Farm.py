@@ -2,7 +2,10 @@ from dataclasses import dataclass, field
 from typing import List, Tuple
 import math
 
-@dataclass
+# Una semana logística son 5 días laborables.
+LOGISTIC_WEEK_DAYS = 5
+
+@dataclass(slots=True)
 class Farm:
     """Representa una granja de porcos."""
     
@@ -21,6 +24,21 @@ class Farm:
     pigs_delivered_week: int = 0
     last_delivery_day: int = -5
     weekly_inventory_history: List[int] = field(default_factory=list)
+    last_delivery_week: int = field(init=False, default=-1)
+    idx: int = -1
+    daily_growth_rate: float = field(init=False, repr=False, default=0.0)
+    # Coordenadas en radianes y cos(lat), fijas; las usa `geo.haversine_matrix_rad`.
+    _lat_rad: float = field(init=False, repr=False, default=0.0)
+    _lon_rad: float = field(init=False, repr=False, default=0.0)
+    _cos_lat: float = field(init=False, repr=False, default=1.0)
+    
+    def __post_init__(self):
+        self.daily_growth_rate = self.growth_rate_kg_per_week / 7
+        self._lat_rad = math.radians(self.lat)
+        self._lon_rad = math.radians(self.lon)
+        self._cos_lat = math.cos(self._lat_rad)
+        if self.last_delivery_day >= 0:
+            self.last_delivery_week = self.last_delivery_day // LOGISTIC_WEEK_DAYS
     
     def get_location(self) -> Tuple[float, float]:
         """Retorna coordenadas GPS."""
@@ -32,9 +50,7 @@ class Farm:
     
     def update_growth(self, days_passed: int = 1):
         """Actualiza el peso según días transcurridos."""
-        weekly_growth = self.growth_rate_kg_per_week
-        daily_growth = weekly_growth / 7
-        self.avg_weight_kg += daily_growth * days_passed
+        self.avg_weight_kg += self.daily_growth_rate * days_passed
         self.age_weeks += days_passed / 7
     
     def get_revenue(self, pigs_count: int, avg_weight: float) -> Tuple[float, float]:
@@ -45,17 +61,15 @@ class Farm:
         Retorna: (ingresos_totales, penalización_aplicada)
         """
         total_kg = pigs_count * avg_weight
-        penalty = 0.0
         
-        if (avg_weight < 105 or avg_weight > 115) and (100 <= avg_weight <= 120):
-            penalty = 0.15
-        elif avg_weight < 100 or avg_weight > 120:
-            penalty = 0.20
+        out_ideal = (avg_weight < 105) | (avg_weight > 115)
+        way_out = (avg_weight < 100) | (avg_weight > 120)
+        penalty = 0.20 * way_out + 0.15 * (out_ideal & (not way_out))
         
         revenue = total_kg * self.price_per_kg * (1 - penalty)
         return revenue, penalty
     
-    def can_deliver_today(self, current_day: int) -> bool:
+    def can_deliver_today(self, current_week: int) -> bool:
         """
         Comprueba si puede entregar hoy.
         
@@ -64,16 +78,14 @@ class Farm:
         - días 0–4: semana 0
         - días 5–9: semana 1
         etc.
+        
+        Recibe la semana actual (`current_day // LOGISTIC_WEEK_DAYS`), que el
+        llamador calcula una sola vez por día.
         """
         if self.inventory_pigs <= 0:
             return False
         
-        if self.last_delivery_day < 0:
-            return True
-        
-        current_week = current_day // 5
-        last_week = self.last_delivery_day // 5
-        return current_week != last_week
+        return current_week != self.last_delivery_week
     
     def deliver_pigs(self, pigs_count: int, current_day: int) -> bool:
         """
@@ -86,16 +98,44 @@ class Farm:
         if pigs_count > self.inventory_pigs:
             return False
         
-        if not self.can_deliver_today(current_day):
+        current_week = current_day // LOGISTIC_WEEK_DAYS
+        if not self.can_deliver_today(current_week):
             return False
         
         self.inventory_pigs -= pigs_count
         self.pigs_delivered_week += pigs_count
         self.last_delivery_day = current_day
+        self.last_delivery_week = current_week
+        
         self.weekly_inventory_history.append(self.inventory_pigs)
         
         return True
     
+    def snapshot(self) -> tuple:
+        """Estado mutable de la granja, para restaurarlo con `restore`."""
+        return (
+            self.inventory_pigs,
+            self.avg_weight_kg,
+            self.age_weeks,
+            self.pigs_delivered_week,
+            self.last_delivery_day,
+            self.last_delivery_week,
+            len(self.weekly_inventory_history),
+        )
+    
+    def restore(self, snap: tuple):
+        """Vuelve al estado guardado por `snapshot`."""
+        (
+            self.inventory_pigs,
+            self.avg_weight_kg,
+            self.age_weeks,
+            self.pigs_delivered_week,
+            self.last_delivery_day,
+            self.last_delivery_week,
+            history_n,
+        ) = snap
+        del self.weekly_inventory_history[history_n:]
+    
     def reset_weekly_counter(self):
         """Reinicia contador semanal (se llama al fin de semana logística)."""
         self.pigs_delivered_week = 0
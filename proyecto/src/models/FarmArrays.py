@@ -0,0 +1,112 @@
+"""
+FarmArrays
+==========
+
+Representación Structure-of-Arrays (SoA) del estado de las granjas.
+
+Los objetos `Farm` siguen siendo la vista por entidad que usan el
+`Router` y la visualización; `FarmArrays` guarda las mismas magnitudes
+en arrays NumPy para que el `Simulator` pueda aplicar las operaciones
+diarias (crecimiento, máscaras de entrega) a todas las granjas de golpe.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+from src.models.Farm import Farm
+from src.models.farm_kernels import can_deliver_today_batch, update_growth_batch
+
+
+@dataclass
+class FarmArrays:
+    """
+    Arrays paralelos indexados por la posición de la granja en `farms`.
+
+    Las coordenadas se guardan en float32 (precisión de sobra para
+    Cataluña). El peso, la edad y el crecimiento diario siguen en float64 porque se acumulan
+    día a día y se vuelcan a los objetos `Farm`.
+    """
+
+    farms: List[Farm]
+    lat: np.ndarray
+    lon: np.ndarray
+    inventory_pigs: np.ndarray
+    avg_weight_kg: np.ndarray
+    daily_growth_rate: np.ndarray
+    age_weeks: np.ndarray
+    last_delivery_week: np.ndarray
+    pigs_delivered_week: np.ndarray
+    # Inventario de cada granja al cierre de cada semana logística (granjas x semanas).
+    weekly_inventory_history: np.ndarray = field(
+        default_factory=lambda: np.zeros((0, 0), dtype=np.int64)
+    )
+
+    @classmethod
+    def from_farms(cls, farms: List[Farm]) -> "FarmArrays":
+        """
+        Empaqueta el estado actual de una lista de granjas y asigna a cada
+        una su índice `idx` dentro de los arrays.
+        """
+        for i, farm in enumerate(farms):
+            farm.idx = i
+
+        return cls(
+            farms=farms,
+            lat=np.array([f.lat for f in farms], dtype=np.float32),
+            lon=np.array([f.lon for f in farms], dtype=np.float32),
+            inventory_pigs=np.array([f.inventory_pigs for f in farms], dtype=np.int64),
+            avg_weight_kg=np.array([f.avg_weight_kg for f in farms], dtype=np.float64),
+            daily_growth_rate=np.array([f.daily_growth_rate for f in farms], dtype=np.float64),
+            age_weeks=np.array([f.age_weeks for f in farms], dtype=np.float64),
+            last_delivery_week=np.array([f.last_delivery_week for f in farms], dtype=np.int64),
+            pigs_delivered_week=np.array([f.pigs_delivered_week for f in farms], dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.farms)
+
+    def update_growth(self, days_passed: int = 1) -> None:
+        """Actualiza peso y edad de todas las granjas en una sola pasada."""
+        update_growth_batch(
+            self.avg_weight_kg, self.age_weeks, self.daily_growth_rate, days_passed
+        )
+
+        for farm, weight, age in zip(
+            self.farms, self.avg_weight_kg.tolist(), self.age_weeks.tolist()
+        ):
+            farm.avg_weight_kg = weight
+            farm.age_weeks = age
+
+    def can_deliver_mask(self, current_week: int) -> np.ndarray:
+        """Máscara booleana de granjas que pueden entregar en la semana logística actual."""
+        return can_deliver_today_batch(self.inventory_pigs, self.last_delivery_week, current_week)
+
+    def start_weekly_history(self, n_weeks: int) -> None:
+        """Reserva la matriz de inventario semanal para `n_weeks` semanas."""
+        self.weekly_inventory_history = np.zeros((len(self.farms), n_weeks), dtype=np.int64)
+
+    def close_week(self, week: int) -> None:
+        """
+        Cierra una semana logística guardando el inventario de todas las
+        granjas en la columna `week`. No toca `pigs_delivered_week`, que
+        sigue acumulando durante toda la simulación.
+        """
+        self.weekly_inventory_history[:, week] = self.inventory_pigs
+
+    def deliver_pigs(self, idx: int, pigs_count: int, current_day: int) -> bool:
+        """
+        Entrega porcos de la granja `idx` y mantiene los arrays sincronizados.
+        Retorna True si se completó la entrega.
+        """
+        farm = self.farms[idx]
+        if not farm.deliver_pigs(pigs_count, current_day):
+            return False
+
+        self.inventory_pigs[idx] = farm.inventory_pigs
+        self.pigs_delivered_week[idx] = farm.pigs_delivered_week
+        self.last_delivery_week[idx] = farm.last_delivery_week
+        return True
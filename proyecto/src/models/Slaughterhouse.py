@@ -1,8 +1,28 @@
 from dataclasses import dataclass, field
-from typing import Tuple, List
+from typing import List, NamedTuple, Optional, Tuple, Union
 import math
 
-@dataclass
+import numpy as np
+
+# Una fila por entrega recibida (mismos campos que Receipt, sin timestamp).
+HISTORY_DTYPE = np.dtype([
+    ("pigs_count", np.int32),
+    ("avg_weight_kg", np.float64),
+    ("total_kg_live", np.float64),
+    ("penalty_applied", np.float64),
+    ("revenue", np.float64),
+])
+
+class Receipt(NamedTuple):
+    """Información de una entrega aceptada por el escorxador."""
+    pigs_count: int
+    avg_weight_kg: float
+    total_kg_live: float
+    penalty_applied: float
+    revenue: float
+    timestamp: Optional[str] = None
+
+@dataclass(slots=True)
 class Slaughterhouse:
     """Representa un escorxador."""
     
@@ -19,7 +39,25 @@ class Slaughterhouse:
     
     pigs_received_today: int = 0
     total_weight_received: float = 0.0
-    daily_history: List[dict] = field(default_factory=list)
+    idx: int = -1
+    
+    _history: np.ndarray = field(init=False, repr=False)
+    _history_n: int = field(init=False, repr=False, default=0)
+    # Coordenadas en radianes y cos(lat), fijas; las usa `geo.haversine_matrix_rad`.
+    _lat_rad: float = field(init=False, repr=False, default=0.0)
+    _lon_rad: float = field(init=False, repr=False, default=0.0)
+    _cos_lat: float = field(init=False, repr=False, default=1.0)
+    
+    def __post_init__(self):
+        self._history = np.zeros(64, dtype=HISTORY_DTYPE)
+        self._lat_rad = math.radians(self.lat)
+        self._lon_rad = math.radians(self.lon)
+        self._cos_lat = math.cos(self._lat_rad)
+    
+    @property
+    def daily_history(self) -> np.ndarray:
+        """Entregas registradas, como array estructurado (una fila por entrega)."""
+        return self._history[:self._history_n]
     
     def get_location(self) -> Tuple[float, float]:
         """Retorna coordenadas GPS."""
@@ -38,18 +76,25 @@ class Slaughterhouse:
         Calcula la penalización según el peso promedio.
         Retorna el porcentaje de penalización (0.0, 0.15, 0.20).
         """
-        if avg_weight_kg < self.penalty_20_min or avg_weight_kg > self.penalty_20_max:
-            return 0.20
-        
-        if avg_weight_kg < self.penalty_15_min or avg_weight_kg > self.penalty_15_max:
-            return 0.15
-        
-        return 0.0
+        out_20 = (avg_weight_kg < self.penalty_20_min) | (avg_weight_kg > self.penalty_20_max)
+        out_15 = (avg_weight_kg < self.penalty_15_min) | (avg_weight_kg > self.penalty_15_max)
+        return 0.20 * out_20 + 0.15 * (out_15 & (not out_20))
     
-    def receive_pigs(self, pigs_count: int, avg_weight_kg: float) -> Tuple[bool, dict]:
+    def calculate_penalties_batch(self, weights_kg: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de `calculate_penalty` para un array de pesos.
+        Retorna un array con la penalización de cada peso (0.0, 0.15, 0.20).
+        """
+        weights_kg = np.asarray(weights_kg, dtype=np.float64)
+        out_20 = (weights_kg < self.penalty_20_min) | (weights_kg > self.penalty_20_max)
+        out_15 = (weights_kg < self.penalty_15_min) | (weights_kg > self.penalty_15_max)
+        return np.select([out_20, out_15], [0.20, 0.15], default=0.0)
+    
+    def receive_pigs(self, pigs_count: int, avg_weight_kg: float) -> Tuple[bool, Union[Receipt, dict]]:
         """
         Recibe porcos al escorxador.
-        Retorna: (éxito, información_recepción)
+        Retorna: (éxito, recibo). Si el escorxador ya está a capacidad
+        máxima, en lugar del recibo va {"error": motivo}.
         """
         if self.is_at_capacity():
             return False, {"error": "Escorxador a capacidad máxima"}
@@ -64,28 +109,36 @@ class Slaughterhouse:
         self.pigs_received_today += pigs_count
         self.total_weight_received += total_kg_live
         
-        receipt_info = {
-            "pigs_count": pigs_count,
-            "avg_weight_kg": avg_weight_kg,
-            "total_kg_live": total_kg_live,
-            "penalty_applied": penalty,
-            "revenue": revenue,
-            "timestamp": None 
-        }
+        receipt = Receipt(pigs_count, avg_weight_kg, total_kg_live, penalty, revenue)
+        
+        if self._history_n == len(self._history):
+            self._history = np.resize(self._history, 2 * len(self._history))
+        self._history[self._history_n] = receipt[:5]
+        self._history_n += 1
         
-        self.daily_history.append(receipt_info)
-        return True, receipt_info
+        return True, receipt
     
     def reset_daily_counter(self):
         """Reinicia contadores diarios (fin del día)."""
         self.pigs_received_today = 0
         self.total_weight_received = 0.0
     
+    def snapshot(self) -> tuple:
+        """
+        Estado mutable del escorxador, para restaurarlo con `restore`.
+        El historial solo crece por el final, así que basta su longitud.
+        """
+        return (self.pigs_received_today, self.total_weight_received, self._history_n)
+    
+    def restore(self, snap: tuple):
+        """Vuelve al estado guardado por `snapshot`."""
+        self.pigs_received_today, self.total_weight_received, self._history_n = snap
+    
     def get_daily_summary(self) -> dict:
         """Retorna resumen del día actual."""
-        total_revenue = sum(r["revenue"] for r in self.daily_history)
-        total_penalty = sum(r["penalty_applied"] for r in self.daily_history)
-        avg_penalty = total_penalty / len(self.daily_history) if self.daily_history else 0
+        history = self.daily_history
+        total_revenue = float(history["revenue"].sum())
+        avg_penalty = float(history["penalty_applied"].mean()) if len(history) else 0
         
         return {
             "slaughterhouse_id": self.slaughterhouse_id,
@@ -95,7 +148,7 @@ class Slaughterhouse:
             "capacity_utilized": f"{(self.pigs_received_today / self.capacity_per_day * 100):.1f}%",
             "total_revenue": total_revenue,
             "avg_penalty_applied": avg_penalty,
-            "deliveries_count": len(self.daily_history)
+            "deliveries_count": len(history)
         }
     
     def __repr__(self) -> str:
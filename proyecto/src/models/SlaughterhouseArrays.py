@@ -0,0 +1,93 @@
+"""
+SlaughterhouseArrays
+====================
+
+Representación Structure-of-Arrays (SoA) de los escorxadores.
+
+Igual que `FarmArrays`: los objetos `Slaughterhouse` siguen siendo la
+vista por entidad y estos arrays permiten al `Simulator` consultar y
+reiniciar las capacidades de todos los escorxadores a la vez.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from src.models.Slaughterhouse import Receipt, Slaughterhouse
+
+
+@dataclass
+class SlaughterhouseArrays:
+    """
+    Arrays paralelos indexados por la posición del escorxador en `slaughterhouses`.
+
+    Coordenadas, precios y umbrales de penalización son datos fijos y
+    se guardan en float32.
+    """
+
+    slaughterhouses: List[Slaughterhouse]
+    lat: np.ndarray
+    lon: np.ndarray
+    capacity_per_day: np.ndarray
+    price_per_kg: np.ndarray
+    penalty_15_min: np.ndarray
+    penalty_15_max: np.ndarray
+    penalty_20_min: np.ndarray
+    penalty_20_max: np.ndarray
+    pigs_received_today: np.ndarray
+
+    @classmethod
+    def from_slaughterhouses(
+        cls, slaughterhouses: List[Slaughterhouse]
+    ) -> "SlaughterhouseArrays":
+        """
+        Empaqueta el estado actual de una lista de escorxadores y asigna a
+        cada uno su índice `idx` dentro de los arrays.
+        """
+        for i, sh in enumerate(slaughterhouses):
+            sh.idx = i
+
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.array([getattr(sh, attr) for sh in slaughterhouses], dtype=dtype)
+
+        return cls(
+            slaughterhouses=slaughterhouses,
+            lat=column("lat", np.float32),
+            lon=column("lon", np.float32),
+            capacity_per_day=column("capacity_per_day", np.int64),
+            price_per_kg=column("price_per_kg", np.float32),
+            penalty_15_min=column("penalty_15_min", np.float32),
+            penalty_15_max=column("penalty_15_max", np.float32),
+            penalty_20_min=column("penalty_20_min", np.float32),
+            penalty_20_max=column("penalty_20_max", np.float32),
+            pigs_received_today=column("pigs_received_today", np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.slaughterhouses)
+
+    def available_capacity(self) -> np.ndarray:
+        """Capacidad disponible hoy de cada escorxador."""
+        return np.maximum(0, self.capacity_per_day - self.pigs_received_today)
+
+    def receive_pigs(
+        self, idx: int, pigs_count: int, avg_weight_kg: float
+    ) -> Tuple[bool, Union[Receipt, dict]]:
+        """
+        Recibe porcos en el escorxador `idx` y mantiene los arrays sincronizados.
+        Retorna lo mismo que `Slaughterhouse.receive_pigs`.
+        """
+        sh = self.slaughterhouses[idx]
+        ok, receipt = sh.receive_pigs(pigs_count, avg_weight_kg)
+        if ok:
+            self.pigs_received_today[idx] = sh.pigs_received_today
+        return ok, receipt
+
+    def reset_daily_counters(self) -> None:
+        """Reinicia los contadores diarios de todos los escorxadores."""
+        self.pigs_received_today.fill(0)
+        for sh in self.slaughterhouses:
+            sh.reset_daily_counter()
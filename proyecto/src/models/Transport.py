@@ -52,11 +52,15 @@ class Transport:
     current_route: Route = None
     hours_used_this_week: float = 0.0
     routes_completed: List[Route] = field(default_factory=list)
+    idx: int = -1
+    _capacity_kg: float = field(init=False, repr=False, default=0.0)
+    
+    def __post_init__(self):
+        self._capacity_kg = self.capacity_tons * 1000.0
     
     def get_available_capacity_kg(self) -> float:
         """Retorna capacidad disponible en kg."""
-        capacity_kg = self.capacity_tons * 1000
-        return max(0, capacity_kg - self.current_load_kg)
+        return max(0, self._capacity_kg - self.current_load_kg)
     
     def get_available_capacity_pigs(self, avg_pig_weight_kg: float) -> int:
         """Retorna cuántos porcos pueden cargarse."""
@@ -67,8 +71,7 @@ class Transport:
     
     def is_full(self) -> bool:
         """Comprueba si está a capacidad."""
-        capacity_kg = self.capacity_tons * 1000
-        return self.current_load_kg >= capacity_kg * 0.95
+        return self.current_load_kg >= self._capacity_kg * 0.95
     
     def can_use_hours(self, hours_needed: float) -> bool:
         """Comprueba si tiene horas disponibles esta semana."""
@@ -113,8 +116,8 @@ class Transport:
         if not self.can_use_hours(time_hours):
             return False, {"error": "Horas insuficientes esta semana"}
         
-
-        trip_cost = distance_km * self.cost_per_km * (self.current_load_kg / (self.capacity_tons * 1000))
+        utilization = self.current_load_kg / self._capacity_kg
+        trip_cost = distance_km * self.cost_per_km * utilization
         
         self.current_route.total_distance_km = distance_km
         self.current_route.total_time_hours = time_hours
@@ -133,7 +136,7 @@ class Transport:
             "pigs_delivered": self.pigs_aboard,
             "load_kg": self.current_load_kg,
             "cost": trip_cost,
-            "capacity_utilized": f"{(self.current_load_kg / (self.capacity_tons * 1000) * 100):.1f}%"
+            "capacity_utilized": f"{(utilization * 100):.1f}%"
         }
         
         self.current_load_kg = 0.0
@@ -162,6 +165,29 @@ class Transport:
             "hours_utilization": f"{(total_time / self.max_hours_per_week * 100):.1f}%"
         }
     
+    def snapshot(self) -> tuple:
+        """Estado mutable del transporte, para restaurarlo con `restore`."""
+        return (
+            self.current_load_kg,
+            self.pigs_aboard,
+            self.status,
+            self.current_route,
+            self.hours_used_this_week,
+            list(self.routes_completed),
+        )
+    
+    def restore(self, snap: tuple):
+        """Vuelve al estado guardado por `snapshot`."""
+        (
+            self.current_load_kg,
+            self.pigs_aboard,
+            self.status,
+            self.current_route,
+            self.hours_used_this_week,
+            routes_completed,
+        ) = snap
+        self.routes_completed = list(routes_completed)
+    
     def reset_weekly(self):
         """Reinicia contadores semanales."""
         self.hours_used_this_week = 0.0
@@ -0,0 +1,103 @@
+"""
+TransportArrays
+===============
+
+Representación Structure-of-Arrays (SoA) del estado de los camiones.
+
+Igual que `FarmArrays` y `SlaughterhouseArrays`: los objetos `Transport`
+siguen siendo la vista por entidad (rutas completadas, resúmenes) y
+estos arrays mantienen capacidad, carga y horas de todos los camiones
+para que el `Simulator` y los kernels puedan leerlas de golpe.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from src.models.Transport import Transport
+
+
+@dataclass
+class TransportArrays:
+    """Arrays paralelos indexados por la posición del camión en `transports`."""
+
+    transports: List[Transport]
+    capacity_kg: np.ndarray
+    cost_per_km: np.ndarray
+    max_hours_per_week: np.ndarray
+    load_kg: np.ndarray
+    pigs_aboard: np.ndarray
+    hours_used_week: np.ndarray
+
+    @classmethod
+    def from_transports(cls, transports: List[Transport]) -> "TransportArrays":
+        """
+        Empaqueta el estado actual de una lista de camiones y asigna a
+        cada uno su índice `idx` dentro de los arrays.
+        """
+        for i, transport in enumerate(transports):
+            transport.idx = i
+
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.array([getattr(t, attr) for t in transports], dtype=dtype)
+
+        return cls(
+            transports=transports,
+            capacity_kg=column("_capacity_kg", np.float64),
+            cost_per_km=column("cost_per_km", np.float64),
+            max_hours_per_week=column("max_hours_per_week", np.float64),
+            load_kg=column("current_load_kg", np.float64),
+            pigs_aboard=column("pigs_aboard", np.int64),
+            hours_used_week=column("hours_used_this_week", np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.transports)
+
+    def _sync(self, idx: int) -> None:
+        transport = self.transports[idx]
+        self.load_kg[idx] = transport.current_load_kg
+        self.pigs_aboard[idx] = transport.pigs_aboard
+        self.hours_used_week[idx] = transport.hours_used_this_week
+
+    def load_pigs(self, idx: int, pigs_count: int, avg_weight_kg: float) -> Tuple[bool, int]:
+        """
+        Carga porcos en el camión `idx` y mantiene los arrays sincronizados.
+        Retorna: (éxito, cantidad_cargada)
+        """
+        ok, pigs_loaded = self.transports[idx].load_pigs(pigs_count, avg_weight_kg)
+        if ok:
+            self._sync(idx)
+        return ok, pigs_loaded
+
+    def cancel_route(self, idx: int) -> None:
+        """Descarta la ruta en curso del camión `idx` sin registrarla."""
+        transport = self.transports[idx]
+        transport.current_load_kg = 0.0
+        transport.pigs_aboard = 0
+        transport.current_route = None
+        self._sync(idx)
+
+    def complete_route(
+        self, idx: int, distance_km: float, time_hours: float
+    ) -> Tuple[bool, dict]:
+        """
+        Completa la ruta en curso del camión `idx` y mantiene los arrays
+        sincronizados.
+        Retorna: (éxito, información_ruta)
+        """
+        ok, route_info = self.transports[idx].complete_route(distance_km, time_hours)
+        if ok:
+            self._sync(idx)
+        return ok, route_info
+
+    def reset_weekly(self) -> None:
+        """Reinicia los contadores semanales de todos los camiones."""
+        for transport in self.transports:
+            transport.reset_weekly()
+        self.load_kg.fill(0.0)
+        self.pigs_aboard.fill(0)
+        self.hours_used_week.fill(0.0)
@@ -0,0 +1,34 @@
+"""
+farm_kernels.py
+===============
+
+Kernels numéricos sobre los arrays de `FarmArrays`, compilados con Numba
+cuando está disponible (ver `src.utils.jit`).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def update_growth_batch(avg_weight_kg, age_weeks, daily_growth_rate, days_passed):
+    """Actualiza in-place peso y edad de todas las granjas."""
+    for i in range(avg_weight_kg.shape[0]):
+        avg_weight_kg[i] += daily_growth_rate[i] * days_passed
+        age_weeks[i] += days_passed / 7
+
+
+@njit(cache=True)
+def can_deliver_today_batch(inventory_pigs, last_delivery_week, current_week):
+    """
+    Máscara de granjas que pueden entregar hoy: con inventario y sin
+    entrega previa en la semana logística actual.
+    """
+    n = inventory_pigs.shape[0]
+    mask = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        mask[i] = inventory_pigs[i] > 0 and last_delivery_week[i] != current_week
+    return mask
@@ -4,19 +4,53 @@ Optimizer
 
 Espacio para jugar con heurísticas de optimización encima del simulador.
 
-Lo que hay aquí es un esqueleto sencillo que hace una búsqueda de rejilla
-sobre el peso mínimo de sacrificio y se queda con el mejor resultado
-según beneficio neto.
+Lo que hay aquí es un esqueleto sencillo que busca el peso mínimo de
+sacrificio (rejilla, rejilla multiresolución o búsqueda ternaria) y se
+queda con el mejor resultado según beneficio neto.
 """
 
 from __future__ import annotations
 
-from typing import List, Tuple
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from src.simulation.Simulator import Simulator
-from src.utils.metrics import compute_global_kpis
+from src.utils.metrics import compute_global_kpis, compute_net_profit
+
+
+def _evaluate_candidate(args: tuple) -> Tuple[float, Dict[str, list], float]:
+    """
+    Ejecuta una simulación completa para un peso mínimo candidato.
+
+    Reutiliza el `Simulator` recibido: guarda su estado, cambia solo el
+    peso mínimo del `Router`, simula y restaura el estado, de modo que
+    cada candidato parte de las mismas granjas, escorxadores y camiones.
+    Está a nivel de módulo para que se pueda enviar a otro proceso.
+
+    Devuelve los eventos sin convertir a DataFrame: solo se construye
+    el del candidato ganador (ver `Optimizer._best_result`).
+
+    Returns
+    -------
+    (weight, raw_events, net_profit)
+    """
+    sim, w, days = args
+
+    snap = sim.snapshot()
+    base_weight = sim.router.min_market_weight_kg
+    sim.router.min_market_weight_kg = w
+    try:
+        events = sim.run(days=days, return_df=False)
+    finally:
+        sim.router.min_market_weight_kg = base_weight
+        sim.restore(snap)
+
+    return w, events, compute_net_profit(events)
 
 
 class Optimizer:
@@ -27,39 +61,145 @@ class Optimizer:
     def __init__(self, base_simulator: Simulator):
         self.base_simulator = base_simulator
 
+    def _evaluate_weights(
+        self,
+        weights_kg: List[float],
+        days: int,
+        executor: Optional[Executor] = None,
+    ) -> List[Tuple[float, Dict[str, list], float]]:
+        """
+        Simula cada peso candidato, en `executor` si se pasa o en serie en
+        el proceso actual si no. Conserva el orden de `weights_kg`.
+        """
+        tasks = [(self.base_simulator, w, days) for w in weights_kg]
+
+        if executor is None or len(tasks) <= 1:
+            return list(map(_evaluate_candidate, tasks))
+        return list(executor.map(_evaluate_candidate, tasks))
+
+    @staticmethod
+    def _best_result(
+        results: List[Tuple[float, Dict[str, list], float]],
+    ) -> Tuple[float, pd.DataFrame, dict]:
+        """
+        Resultado con mayor beneficio neto (en caso de empate, el primero).
+        Solo para él se construye el DataFrame de eventos y los KPIs.
+        """
+        best_weight = None
+        best_profit = float("-inf")
+        best_raw = None
+
+        for w, raw_events, net_profit in results:
+            if net_profit > best_profit:
+                best_profit = net_profit
+                best_weight = w
+                best_raw = raw_events
+
+        if best_raw is None or not best_raw["day"]:
+            best_events = pd.DataFrame()
+        else:
+            best_events = pd.DataFrame(best_raw)
+
+        best_kpis = compute_global_kpis(best_events) if best_weight is not None else {}
+        return best_weight, best_events, best_kpis
+
+    @staticmethod
+    def _executor(max_workers: int) -> ContextManager[Optional[Executor]]:
+        """
+        Pool de procesos para evaluar candidatos en paralelo, solo si se
+        pide explícitamente `max_workers > 1`; si no, contexto vacío
+        (evaluación en serie). Los workers se crean con "spawn" y el pool
+        se cierra al salir del `with`, así que no quedan procesos colgados.
+
+        Cada tarea envía el `Simulator` completo al worker, lo que para
+        simulaciones cortas cuesta más que simularlas en serie. Con
+        "spawn", el script que llama debe proteger su punto de entrada con
+        `if __name__ == "__main__":`.
+        """
+        if max_workers is None or max_workers <= 1:
+            return nullcontext()
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
     def search_best_min_weight(
-        self, candidates_kg: List[float], days: int = 7
+        self,
+        candidates_kg: List[float],
+        days: int = 7,
+        max_workers: int = 1,
+        multi_resolution: bool = False,
+        refine_points: int = 5,
     ) -> Tuple[float, pd.DataFrame, dict]:
         """
         Prueba varios valores del peso mínimo de sacrificio y devuelve
         el que da mejor beneficio neto.
 
+        Por defecto los candidatos se evalúan en serie en el proceso
+        actual. Con `max_workers > 1` se reparten en un pool de ese número
+        de procesos (ver `_executor`); solo compensa con simulaciones largas.
+
+        Con `multi_resolution=True`, tras la rejilla gruesa se prueban
+        `refine_points` pesos más entre los dos vecinos del mejor candidato.
+
         Returns
         -------
         (best_weight, events_df, kpis_dict)
         """
-        best_weight = None
-        best_profit = float("-inf")
-        best_events = pd.DataFrame()
-        best_kpis = {}
-
-        for w in candidates_kg:
-            sim = Simulator(
-                farms=self.base_simulator.farms,
-                slaughterhouses=self.base_simulator.slaughterhouses,
-                transports=self.base_simulator.transports,
-                biological_manager=self.base_simulator.bio,
-                speed_kmh=self.base_simulator.router.speed_kmh,
-                min_market_weight_kg=w,
-            )
-
-            events = sim.run(days=days)
-            kpis = compute_global_kpis(events)
-
-            if kpis["net_profit"] > best_profit:
-                best_profit = kpis["net_profit"]
-                best_weight = w
-                best_events = events
-                best_kpis = kpis
+        with self._executor(max_workers) as executor:
+            results = self._evaluate_weights(candidates_kg, days, executor)
 
-        return best_weight, best_events, best_kpis
+            if multi_resolution and len(candidates_kg) > 1:
+                best_weight = self._best_result(results)[0]
+                grid = sorted(set(candidates_kg))
+                i = grid.index(best_weight)
+                lo = grid[max(i - 1, 0)]
+                hi = grid[min(i + 1, len(grid) - 1)]
+
+                fine = [
+                    float(w) for w in np.linspace(lo, hi, refine_points + 2)[1:-1]
+                    if w not in grid
+                ]
+                results += self._evaluate_weights(fine, days, executor)
+
+        return self._best_result(results)
+
+    def search_best_min_weight_ternary(
+        self,
+        lo_kg: float,
+        hi_kg: float,
+        tol: float = 0.5,
+        days: int = 7,
+        max_workers: int = 1,
+    ) -> Tuple[float, pd.DataFrame, dict]:
+        """
+        Búsqueda ternaria del peso mínimo de sacrificio en [lo_kg, hi_kg].
+
+        Supone que el beneficio neto es unimodal en el peso: en cada
+        iteración simula los dos tercios interiores, descarta el tercio
+        peor y para cuando el intervalo mide menos de `tol` kg. Necesita
+        O(log((hi - lo) / tol)) simulaciones en vez de una por punto de
+        rejilla. Con `max_workers > 1` las dos simulaciones de cada
+        iteración se lanzan en paralelo (ver `search_best_min_weight`).
+
+        Returns
+        -------
+        (best_weight, events_df, kpis_dict) del mejor peso simulado.
+        """
+        results: List[Tuple[float, Dict[str, list], float]] = []
+
+        with self._executor(max_workers) as executor:
+            lo, hi = lo_kg, hi_kg
+            while hi - lo > tol:
+                m1 = lo + (hi - lo) / 3
+                m2 = hi - (hi - lo) / 3
+                r1, r2 = self._evaluate_weights([m1, m2], days, executor)
+                results += [r1, r2]
+
+                if r1[2] < r2[2]:
+                    lo = m1
+                else:
+                    hi = m2
+
+            results += self._evaluate_weights([(lo + hi) / 2], days, executor)
+
+        return self._best_result(results)
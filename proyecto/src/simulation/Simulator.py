@@ -11,16 +11,40 @@ Se apoya en:
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 
+import numpy as np
 import pandas as pd
 
-from src.models.Farm import Farm
+from src.models.Farm import Farm, LOGISTIC_WEEK_DAYS
+from src.models.FarmArrays import FarmArrays
 from src.models.Slaughterhouse import Slaughterhouse
+from src.models.SlaughterhouseArrays import SlaughterhouseArrays
 from src.models.Transport import Transport
-from src.simulation.Router import Router, PlannedRoute, PlannedStop
+from src.models.TransportArrays import TransportArrays
+from src.simulation.Router import Router, PlannedRoute
 from src.utils.BiologicalDataManager import BiologicalDataManager
 
+# Columnas del registro de eventos (una fila por ruta ejecutada).
+EVENT_COLUMNS = (
+    "day",
+    "route_index",
+    "route_id",
+    "transport_id",
+    "transport_type",
+    "slaughterhouse_id",
+    "slaughterhouse_name",
+    "farms_visited",
+    "pigs_delivered",
+    "avg_weight_kg",
+    "distance_km",
+    "time_hours",
+    "transport_cost",
+    "capacity_utilized_pct",
+    "revenue",
+    "penalty_applied",
+)
+
 
 class Simulator:
     """
@@ -42,12 +66,17 @@ class Simulator:
         min_market_weight_kg: float = 105.0,
         max_stops_per_route: int = 3,
         max_hours_per_day: float = 8.0,
+        distance_matrix: Optional[np.ndarray] = None,
     ):
         self.farms = farms
         self.slaughterhouses = slaughterhouses
         self.transports = transports
         self.bio = biological_manager
 
+        self.farm_arrays = FarmArrays.from_farms(self.farms)
+        self.sh_arrays = SlaughterhouseArrays.from_slaughterhouses(self.slaughterhouses)
+        self.tr_arrays = TransportArrays.from_transports(self.transports)
+
         self.router = Router(
             farms=self.farms,
             slaughterhouses=self.slaughterhouses,
@@ -56,29 +85,41 @@ class Simulator:
             min_market_weight_kg=min_market_weight_kg,
             max_stops_per_route=max_stops_per_route,
             max_hours_per_day=max_hours_per_day,
+            distance_matrix=distance_matrix,
         )
+        self.distance_matrix = self.router.distance_matrix
 
-        self._events: List[Dict[str, Any]] = []
+        # Registro de eventos por columnas: una lista por clave de EVENT_COLUMNS.
+        self._events: Dict[str, List[Any]] = {col: [] for col in EVENT_COLUMNS}
 
 
-    def run(self, days: int = 7) -> pd.DataFrame:
+    def run(
+        self, days: int = 7, return_df: bool = True
+    ) -> Union[pd.DataFrame, Dict[str, List[Any]]]:
         """
         Ejecuta la simulación un número de días.
 
         Returns
         -------
         pd.DataFrame
-            Un registro fila-a-fila de cada ruta ejecutada.
+            Un registro fila-a-fila de cada ruta ejecutada. Con
+            `return_df=False` se devuelve el registro sin convertir (dict
+            columna -> lista de valores, claves de EVENT_COLUMNS), para
+            quien no necesita el DataFrame (p. ej. `Optimizer`).
         """
-        self._events.clear()
+        # Listas nuevas en cada ejecución: el dict devuelto con
+        # `return_df=False` no se modifica en ejecuciones posteriores.
+        self._events = {col: [] for col in EVENT_COLUMNS}
+        self.farm_arrays.start_weekly_history(-(-days // LOGISTIC_WEEK_DAYS))
 
         for day in range(days):
             self._simulate_single_day(day)
+            if (day + 1) % LOGISTIC_WEEK_DAYS == 0 or day == days - 1:
+                self.farm_arrays.close_week(day // LOGISTIC_WEEK_DAYS)
 
-        if not self._events:
-            return pd.DataFrame()
-
-        return pd.DataFrame(self._events)
+        if not return_df:
+            return self._events
+        return self.get_events()
 
 
     def _simulate_single_day(self, day: int) -> None:
@@ -87,26 +128,39 @@ class Simulator:
         - Se planifican rutas
         - Se ejecutan las rutas
         """
-        for farm in self.farms:
-            farm.update_growth(days_passed=1)
+        self.farm_arrays.update_growth(days_passed=1)
+
+        # El peso no cambia durante el día: se lee una vez del array y se
+        # reutiliza en la planificación y en la ejecución de las rutas.
+        weights = self.farm_arrays.avg_weight_kg
 
-        planned_routes: List[PlannedRoute] = self.router.build_daily_plan(day)
+        deliverable = self.farm_arrays.can_deliver_mask(day // LOGISTIC_WEEK_DAYS)
+        planned_routes: List[PlannedRoute] = self.router.build_daily_plan(
+            day, eligible_farms=np.flatnonzero(deliverable), weights=weights
+        )
 
         if not planned_routes:
             return
 
         for route_idx, planned in enumerate(planned_routes):
-            self._execute_route(day, route_idx, planned)
+            self._execute_route(day, route_idx, planned, weights)
 
-        for sh in self.slaughterhouses:
-            sh.reset_daily_counter()
+        self.sh_arrays.reset_daily_counters()
 
-    def _execute_route(self, day: int, route_index: int, planned: PlannedRoute) -> None:
+    def _execute_route(
+        self,
+        day: int,
+        route_index: int,
+        planned: PlannedRoute,
+        weights: np.ndarray,
+    ) -> None:
         """
         Ejecuta físicamente una PlannedRoute:
         - Carga animales en el camión
         - Registra ruta en el propio transporte
         - Entrega en el escorxador
+
+        `weights` es el peso medio del día de cada granja, por Farm.idx.
         """
         transport = planned.transport
         slaughterhouse = planned.slaughterhouse
@@ -127,17 +181,19 @@ class Simulator:
         farms_visited_ids: List[str] = []
 
         for stop in stops:
-            isinstance(stop, PlannedStop)
-
             farm = stop.farm
             pigs_requested = stop.pigs_to_pick
 
-            current_weight = farm.get_current_weight()
-            success = farm.deliver_pigs(pigs_requested, current_day=day)
+            current_weight = float(weights[farm.idx])
+            success = self.farm_arrays.deliver_pigs(
+                farm.idx, pigs_requested, current_day=day
+            )
             if not success:
                 continue
 
-            load_ok, pigs_loaded = transport.load_pigs(pigs_requested, current_weight)
+            load_ok, pigs_loaded = self.tr_arrays.load_pigs(
+                transport.idx, pigs_requested, current_weight
+            )
             if not load_ok or pigs_loaded <= 0:
                 continue
 
@@ -146,51 +202,73 @@ class Simulator:
             total_weight_kg += pigs_loaded * current_weight
 
         if total_pigs_loaded <= 0:
-            transport.current_load_kg = 0.0
-            transport.pigs_aboard = 0
-            transport.current_route = None
+            self.tr_arrays.cancel_route(transport.idx)
             return
 
         avg_weight = total_weight_kg / total_pigs_loaded
 
-        sh_ok, receipt_info = slaughterhouse.receive_pigs(
+        sh_ok, receipt = self.sh_arrays.receive_pigs(
+            slaughterhouse.idx,
             pigs_count=total_pigs_loaded,
             avg_weight_kg=avg_weight,
         )
         if not sh_ok:
             return
 
-        tr_ok, route_info = transport.complete_route(
+        tr_ok, route_info = self.tr_arrays.complete_route(
+            transport.idx,
             distance_km=planned.distance_km,
             time_hours=planned.time_hours,
         )
         if not tr_ok:
             return
 
-        event: Dict[str, Any] = {
-            "day": day,
-            "route_index": route_index,
-            "route_id": route_identifier,
-            "transport_id": transport.transport_id,
-            "transport_type": transport.type,
-            "slaughterhouse_id": slaughterhouse.slaughterhouse_id,
-            "slaughterhouse_name": slaughterhouse.name,
-            "farms_visited": farms_visited_ids,
-            "pigs_delivered": total_pigs_loaded,
-            "avg_weight_kg": avg_weight,
-            "distance_km": planned.distance_km,
-            "time_hours": planned.time_hours,
-            "transport_cost": route_info.get("cost", 0.0),
-            "capacity_utilized_pct": route_info.get("capacity_utilized"),
-            "revenue": receipt_info.get("revenue", 0.0),
-            "penalty_applied": receipt_info.get("penalty_applied", 0.0),
-        }
-
-        self._events.append(event)
+        events = self._events
+        events["day"].append(day)
+        events["route_index"].append(route_index)
+        events["route_id"].append(route_identifier)
+        events["transport_id"].append(transport.transport_id)
+        events["transport_type"].append(transport.type)
+        events["slaughterhouse_id"].append(slaughterhouse.slaughterhouse_id)
+        events["slaughterhouse_name"].append(slaughterhouse.name)
+        events["farms_visited"].append(farms_visited_ids)
+        events["pigs_delivered"].append(total_pigs_loaded)
+        events["avg_weight_kg"].append(avg_weight)
+        events["distance_km"].append(planned.distance_km)
+        events["time_hours"].append(planned.time_hours)
+        events["transport_cost"].append(route_info.get("cost", 0.0))
+        events["capacity_utilized_pct"].append(route_info.get("capacity_utilized"))
+        events["revenue"].append(receipt.revenue)
+        events["penalty_applied"].append(receipt.penalty_applied)
+
+
+    def snapshot(self) -> tuple:
+        """
+        Guarda el estado mutable de granjas, escorxadores y camiones para
+        poder repetir simulaciones desde el mismo punto (ver `restore`).
+        """
+        return (
+            [farm.snapshot() for farm in self.farms],
+            [sh.snapshot() for sh in self.slaughterhouses],
+            [transport.snapshot() for transport in self.transports],
+        )
+
+    def restore(self, snap: tuple) -> None:
+        """Restaura un estado de `snapshot` y reconstruye los arrays SoA."""
+        farm_snaps, sh_snaps, transport_snaps = snap
+        for farm, farm_snap in zip(self.farms, farm_snaps):
+            farm.restore(farm_snap)
+        for sh, sh_snap in zip(self.slaughterhouses, sh_snaps):
+            sh.restore(sh_snap)
+        for transport, transport_snap in zip(self.transports, transport_snaps):
+            transport.restore(transport_snap)
 
+        self.farm_arrays = FarmArrays.from_farms(self.farms)
+        self.sh_arrays = SlaughterhouseArrays.from_slaughterhouses(self.slaughterhouses)
+        self.tr_arrays = TransportArrays.from_transports(self.transports)
 
     def get_events(self) -> pd.DataFrame:
         """Devuelve una copia del registro de eventos actual."""
-        if not self._events:
+        if not self._events["day"]:
             return pd.DataFrame()
         return pd.DataFrame(self._events)
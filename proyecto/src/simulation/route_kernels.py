@@ -0,0 +1,313 @@
+"""
+route_kernels.py
+================
+
+Kernels numéricos del `Router`, compilados con Numba cuando está
+disponible (ver `src.utils.jit`).
+
+Trabajan solo con arrays indexados por Farm.idx / Slaughterhouse.idx;
+el `Router` traduce el resultado a objetos `PlannedStop` / `PlannedRoute`.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def build_route_kernel(
+    remaining_pigs,
+    remaining_cap_sh,
+    weights,
+    ff_dist,
+    fs_dist,
+    ff_order,
+    fs_order,
+    truck_capacity_kg,
+    sh_idx,
+    max_stops,
+    max_hours,
+    current_hours_used,
+    speed_kmh,
+):
+    """
+    Inserción voraz de hasta `max_stops` granjas en la ruta de un camión
+    hacia el escorxador `sh_idx`.
+
+    En cada parada elige la granja factible con menor distancia
+    incremental. Las candidatas se recorren de más cercana a más lejana
+    (`fs_order[sh_idx]` para la primera parada, `ff_order[última]` para
+    las siguientes), así que el recorrido se corta en cuanto ninguna
+    granja restante puede mejorar la mejor encontrada. Solo se consideran
+    granjas con `remaining_pigs > 0`, que ya son las que pueden entregar hoy.
+
+    Actualiza in-place `remaining_pigs` y `remaining_cap_sh` solo si la
+    ruta tiene al menos una parada.
+
+    Returns:
+        (stop_indices, pigs_per_stop, distance_km, time_hours); sin
+        paradas si no hay ruta factible.
+    """
+    stop_indices = np.empty(max_stops, dtype=np.int64)
+    pigs_per_stop = np.empty(max_stops, dtype=np.int64)
+    n_stops = 0
+    # Granjas ya incluidas en esta ruta, por Farm.idx.
+    in_route = np.zeros(remaining_pigs.shape[0], dtype=np.bool_)
+
+    sh_remaining_cap = remaining_cap_sh[sh_idx]
+    remaining_capacity_kg = truck_capacity_kg
+    distance_km = 0.0
+    # Índice de la última granja de la ruta (-1 mientras está vacía).
+    last_idx = -1
+
+    while n_stops < max_stops:
+        best_candidate = -1
+        best_incremental_distance = np.inf
+        best_new_distance = 0.0
+        best_pigs_to_pick = 0
+
+        if last_idx < 0:
+            order = fs_order[sh_idx]
+        else:
+            order = ff_order[last_idx]
+
+        for k in range(order.shape[0]):
+            f = order[k]
+
+            # Cota inferior del coste de insertar esta granja o cualquiera
+            # posterior en el orden. Ruta vacía: 2·d(f, sh), creciente.
+            # Ruta con paradas: por la desigualdad triangular,
+            # d(l, f) + d(f, sh) - d(l, sh) >= 2·(d(l, f) - d(l, sh)).
+            if last_idx >= 0:
+                bound = 2.0 * (ff_dist[last_idx, f] - fs_dist[last_idx, sh_idx])
+                if bound > best_incremental_distance + 1e-9:
+                    break
+
+            if remaining_pigs[f] <= 0:
+                continue
+
+            if in_route[f]:
+                continue
+
+            avg_w = weights[f]
+            if avg_w <= 0:
+                continue
+
+            max_pigs_by_truck = int(remaining_capacity_kg / avg_w)
+            if max_pigs_by_truck <= 0:
+                continue
+
+            pigs_possible = min(max_pigs_by_truck, remaining_pigs[f], sh_remaining_cap)
+            if pigs_possible <= 0:
+                continue
+
+            # Insertar `f` al final solo cambia el último tramo:
+            # ... -> última -> escorxador  pasa a  ... -> última -> f -> escorxador
+            if last_idx < 0:
+                incremental = fs_dist[f, sh_idx] + fs_dist[f, sh_idx]
+            else:
+                incremental = (
+                    ff_dist[last_idx, f] + fs_dist[f, sh_idx] - fs_dist[last_idx, sh_idx]
+                )
+
+            if incremental < best_incremental_distance:
+                best_incremental_distance = incremental
+                best_candidate = f
+                best_new_distance = distance_km + incremental
+                best_pigs_to_pick = pigs_possible
+
+            # Con la ruta vacía la primera granja factible ya es la más cercana.
+            if last_idx < 0:
+                break
+
+        if best_candidate < 0:
+            break
+
+        new_time_hours = best_new_distance / speed_kmh if speed_kmh > 0 else 0.0
+        if current_hours_used + new_time_hours > max_hours:
+            if n_stops == 0:
+                return stop_indices[:0], pigs_per_stop[:0], 0.0, 0.0
+            break
+
+        stop_indices[n_stops] = best_candidate
+        pigs_per_stop[n_stops] = best_pigs_to_pick
+        n_stops += 1
+        in_route[best_candidate] = True
+        last_idx = best_candidate
+        distance_km = best_new_distance
+        sh_remaining_cap -= best_pigs_to_pick
+        remaining_capacity_kg -= best_pigs_to_pick * weights[best_candidate]
+        remaining_pigs[best_candidate] -= best_pigs_to_pick
+
+        if remaining_capacity_kg <= 0 or sh_remaining_cap <= 0:
+            break
+
+    if n_stops == 0:
+        return stop_indices[:0], pigs_per_stop[:0], 0.0, 0.0
+
+    time_hours = distance_km / speed_kmh if speed_kmh > 0 else 0.0
+    remaining_cap_sh[sh_idx] = sh_remaining_cap
+
+    return stop_indices[:n_stops], pigs_per_stop[:n_stops], distance_km, time_hours
+
+
+@njit(cache=True)
+def _grow(arr):
+    """Duplica la capacidad de un array de salida conservando su contenido."""
+    out = np.empty(2 * arr.shape[0], arr.dtype)
+    out[: arr.shape[0]] = arr
+    return out
+
+
+@njit(cache=True)
+def plan_day_kernel(
+    candidate_idx,
+    weights,
+    remaining_pigs,
+    remaining_cap_sh,
+    tr_capacity_kg,
+    ff_dist,
+    fs_dist,
+    ff_order,
+    fs_order,
+    max_stops,
+    max_hours,
+    speed_kmh,
+):
+    """
+    Planifica todas las rutas de un día: para cada camión (en orden),
+    construye rutas con `build_route_kernel` mientras le queden horas,
+    haya porcos pendientes y algún escorxador con capacidad.
+
+    Cada ruta parte de la candidata más pesada con porcos pendientes
+    (`candidate_idx` viene ordenado por peso descendente) y va al
+    escorxador con capacidad más cercano a ella.
+
+    Returns:
+        (route_transport, route_sh, route_n_stops, route_distance_km,
+        route_time_hours, stop_farm, stop_pigs). Las paradas de todas las
+        rutas van concatenadas en `stop_farm` / `stop_pigs`, en el orden de
+        las rutas; `route_n_stops` indica cuántas corresponden a cada una.
+    """
+    capacity = 16
+    route_transport = np.empty(capacity, dtype=np.int64)
+    route_sh = np.empty(capacity, dtype=np.int64)
+    route_n_stops = np.empty(capacity, dtype=np.int64)
+    route_distance_km = np.empty(capacity, dtype=np.float64)
+    route_time_hours = np.empty(capacity, dtype=np.float64)
+    stop_farm = np.empty(capacity * max_stops, dtype=np.int64)
+    stop_pigs = np.empty(capacity * max_stops, dtype=np.int64)
+    n_routes = 0
+    n_stops_total = 0
+
+    n_candidates = candidate_idx.shape[0]
+    n_sh = remaining_cap_sh.shape[0]
+
+    # Cotas inferiores para descartar camiones sin construir la ruta:
+    # el porco más ligero del día y el viaje de ida y vuelta más corto
+    # entre una granja candidata y cualquier escorxador.
+    min_pig_weight = np.inf
+    min_trip_km = np.inf
+    for k in range(n_candidates):
+        f = candidate_idx[k]
+        min_pig_weight = min(min_pig_weight, weights[f])
+        for s in range(n_sh):
+            min_trip_km = min(min_trip_km, 2.0 * fs_dist[f, s])
+    min_trip_hours = min_trip_km / speed_kmh if speed_kmh > 0 else 0.0
+
+    # Contadores de granjas con porcos pendientes y escorxadores con capacidad.
+    n_farms_with_pigs = 0
+    for f in range(remaining_pigs.shape[0]):
+        if remaining_pigs[f] > 0:
+            n_farms_with_pigs += 1
+    n_sh_with_capacity = 0
+    for s in range(n_sh):
+        if remaining_cap_sh[s] > 0:
+            n_sh_with_capacity += 1
+
+    for t in range(tr_capacity_kg.shape[0]):
+        # Si no cabe ni un porco, el camión no puede hacer ninguna ruta.
+        if tr_capacity_kg[t] < min_pig_weight:
+            continue
+
+        hours_used = 0.0
+        while (
+            hours_used < max_hours
+            and hours_used + min_trip_hours <= max_hours
+            and n_farms_with_pigs > 0
+            and n_sh_with_capacity > 0
+        ):
+            seed = -1
+            for k in range(n_candidates):
+                if remaining_pigs[candidate_idx[k]] > 0:
+                    seed = candidate_idx[k]
+                    break
+            if seed < 0:
+                break
+
+            sh_idx = -1
+            best_dist = np.inf
+            for s in range(n_sh):
+                if remaining_cap_sh[s] > 0 and fs_dist[seed, s] < best_dist:
+                    best_dist = fs_dist[seed, s]
+                    sh_idx = s
+            if sh_idx < 0:
+                break
+
+            stops, pigs, distance_km, time_hours = build_route_kernel(
+                remaining_pigs,
+                remaining_cap_sh,
+                weights,
+                ff_dist,
+                fs_dist,
+                ff_order,
+                fs_order,
+                tr_capacity_kg[t],
+                sh_idx,
+                max_stops,
+                max_hours,
+                hours_used,
+                speed_kmh,
+            )
+            n_stops = stops.shape[0]
+            if n_stops == 0:
+                break
+
+            if n_routes == route_transport.shape[0]:
+                route_transport = _grow(route_transport)
+                route_sh = _grow(route_sh)
+                route_n_stops = _grow(route_n_stops)
+                route_distance_km = _grow(route_distance_km)
+                route_time_hours = _grow(route_time_hours)
+            while n_stops_total + n_stops > stop_farm.shape[0]:
+                stop_farm = _grow(stop_farm)
+                stop_pigs = _grow(stop_pigs)
+
+            route_transport[n_routes] = t
+            route_sh[n_routes] = sh_idx
+            route_n_stops[n_routes] = n_stops
+            route_distance_km[n_routes] = distance_km
+            route_time_hours[n_routes] = time_hours
+            n_routes += 1
+            for i in range(n_stops):
+                stop_farm[n_stops_total + i] = stops[i]
+                stop_pigs[n_stops_total + i] = pigs[i]
+                if remaining_pigs[stops[i]] <= 0:
+                    n_farms_with_pigs -= 1
+            n_stops_total += n_stops
+            if remaining_cap_sh[sh_idx] <= 0:
+                n_sh_with_capacity -= 1
+
+            hours_used += time_hours
+
+    return (
+        route_transport[:n_routes],
+        route_sh[:n_routes],
+        route_n_stops[:n_routes],
+        route_distance_km[:n_routes],
+        route_time_hours[:n_routes],
+        stop_farm[:n_stops_total],
+        stop_pigs[:n_stops_total],
+    )
@@ -6,22 +6,35 @@ Estos datos provienen de los archivos Excel de consumo y peso.
 import pandas as pd
 import numpy as np
 from typing import Tuple, Optional
-from scipy.stats import norm
+from scipy.special import erf
+from scipy.stats import truncnorm
+
+from src.utils.biological_kernels import SQRT2, interp_age, interp_ages_batch, range_pct
 
 class BiologicalDataManager:
     """Gestiona distribuciones de peso y consumo de porcos por edad."""
     
-    def __init__(self, consumption_df: pd.DataFrame, weight_df: pd.DataFrame):
+    def __init__(self, consumption_df: pd.DataFrame, weight_df: pd.DataFrame,
+                 seed: Optional[int] = None):
         """
         Inicializa con datos de consumo y peso.
         
         Args:
             consumption_df: DataFrame con columnas [age_weeks, intake_kg, mean, sd]
             weight_df: DataFrame con columnas [age_weeks, weight_kg, mean, sd]
+            seed: Semilla del generador de `generate_weight_distribution`
         """
+        self._rng = np.random.default_rng(seed)
         self.consumption_df = consumption_df
         self.weight_df = weight_df
         self._normalize_columns()
+        # Columnas (edad, media, sd) ordenadas por edad, resueltas una sola vez.
+        self._weight_columns = self._sorted_columns(self.weight_df)
+        self._consumption_columns = self._sorted_columns(self.consumption_df)
+        # Último tramo encontrado por `interp_age` en cada tabla, punto de
+        # partida de la siguiente búsqueda en esa misma tabla.
+        self._weight_hint = 0
+        self._consumption_hint = 0
     
     def _normalize_columns(self):
         """Normaliza nombres de columnas para consistencia."""
@@ -43,13 +56,10 @@ class BiologicalDataManager:
         if self.weight_df.empty:
             return self._estimate_weight(age_weeks), 5.0
         
-        return self._interpolate_value(
-            self.weight_df, 
-            'age of pigs in week', 
-            age_weeks, 
-            'mean', 
-            'sd'
+        mean, sd, self._weight_hint = self._interpolate_value(
+            self._weight_columns, age_weeks, self._weight_hint
         )
+        return mean, sd
     
     def get_consumption_by_age(self, age_weeks: float) -> Tuple[float, float]:
         """
@@ -61,51 +71,25 @@ class BiologicalDataManager:
         if self.consumption_df.empty:
             return self._estimate_consumption(age_weeks), 2.0
         
-        return self._interpolate_value(
-            self.consumption_df, 
-            'age of pigs in week', 
-            age_weeks, 
-            'mean', 
-            'sd'
+        mean, sd, self._consumption_hint = self._interpolate_value(
+            self._consumption_columns, age_weeks, self._consumption_hint
         )
+        return mean, sd
     
-    def _interpolate_value(self, df: pd.DataFrame, age_col: str, 
-                          age: float, mean_col: str, sd_col: str) -> Tuple[float, float]:
+    @staticmethod
+    def _interpolate_value(columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                           age: float, hint: int) -> Tuple[float, float, int]:
         """
         Interpola valores para una edad entre datos discretos.
+        `columns` son los arrays (edad, media, sd) de `_sorted_columns`.
+        La búsqueda del tramo parte de `hint`, el último encontrado en esa
+        tabla; se devuelve el nuevo tramo junto a (media, sd).
         """
-        age_cols = [c for c in df.columns if 'age' in c.lower() and 'week' in c.lower()]
-        mean_cols = [c for c in df.columns if 'mean' in c.lower()]
-        sd_cols = [c for c in df.columns if 'sd' in c.lower()]
-        
-        if not age_cols or not mean_cols or not sd_cols:
-            return 0.0, 0.0
-        
-        age_col = age_cols[0]
-        mean_col = mean_cols[0]
-        sd_col = sd_cols[0]
-        
-        df_sorted = df.sort_values(age_col)
-        ages = df_sorted[age_col].values
-        means = df_sorted[mean_col].values
-        sds = df_sorted[sd_col].values
-        
-        if age <= ages[0]:
-            return float(means[0]), float(sds[0])
-        
-        if age >= ages[-1]:
-            return float(means[-1]), float(sds[-1])
-        
-        idx = np.searchsorted(ages, age)
-        age1, age2 = ages[idx-1], ages[idx]
-        mean1, mean2 = means[idx-1], means[idx]
-        sd1, sd2 = sds[idx-1], sds[idx]
+        if columns is None:
+            return 0.0, 0.0, hint
         
-        factor = (age - age1) / (age2 - age1)
-        mean = mean1 + factor * (mean2 - mean1)
-        sd = sd1 + factor * (sd2 - sd1)
-        
-        return float(mean), float(sd)
+        mean, sd, hint = interp_age(*columns, float(age), hint)
+        return float(mean), float(sd), int(hint)
     
     def _estimate_weight(self, age_weeks: float) -> float:
         """Estimación simple de peso si no hay datos."""
@@ -119,18 +103,22 @@ class BiologicalDataManager:
                                     num_pigs: int = 1000) -> np.ndarray:
         """
         Genera una distribución de pesos para un lote de porcos.
-        Usa distribución normal basada en datos reales.
+        Usa una distribución normal basada en datos reales, truncada
+        a [5, 150] kg.
         
         Returns:
             Array de pesos en kg para num_pigs porcos
         """
         mean, sd = self.get_weight_by_age(age_weeks)
+        min_kg, max_kg = 5, 150
         
-        weights = np.random.normal(mean, sd, num_pigs)
-        
-        weights = np.clip(weights, 5, 150)
+        if sd <= 0:
+            return np.full(num_pigs, np.clip(mean, min_kg, max_kg), dtype=np.float64)
         
-        return weights
+        # Normal truncada a [min_kg, max_kg]: sin la acumulación en los
+        # extremos que producía recortar con np.clip.
+        a, b = (min_kg - mean) / sd, (max_kg - mean) / sd
+        return truncnorm.rvs(a, b, loc=mean, scale=sd, size=num_pigs, random_state=self._rng)
     
     def get_weight_range_percentage(self, age_weeks: float, 
                                    min_kg: float = 105, 
@@ -148,10 +136,81 @@ class BiologicalDataManager:
         """
         mean, sd = self.get_weight_by_age(age_weeks)
         
-        p_min = norm.cdf(min_kg, mean, sd)
-        p_max = norm.cdf(max_kg, mean, sd)
+        return float(range_pct(mean, sd, float(min_kg), float(max_kg)))
+    
+    def _sorted_columns(self, df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Columnas (edad, media, sd) de una tabla biológica como arrays
+        ordenados por edad, o None si faltan columnas.
+        """
+        age_cols = [c for c in df.columns if 'age' in c.lower() and 'week' in c.lower()]
+        mean_cols = [c for c in df.columns if 'mean' in c.lower()]
+        sd_cols = [c for c in df.columns if 'sd' in c.lower()]
+        
+        if not age_cols or not mean_cols or not sd_cols:
+            return None
         
-        return (p_max - p_min) * 100
+        df_sorted = df.sort_values(age_cols[0])
+        return (
+            df_sorted[age_cols[0]].to_numpy(dtype=np.float64),
+            df_sorted[mean_cols[0]].to_numpy(dtype=np.float64),
+            df_sorted[sd_cols[0]].to_numpy(dtype=np.float64),
+        )
+    
+    @staticmethod
+    def _interpolate_batch(columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                           ages: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Versión vectorizada de `_interpolate_value`: interpola media y sd
+        para un array de edades, con los mismos extremos (fuera del rango
+        de datos se usa el primer/último valor).
+        """
+        if columns is None:
+            return np.zeros_like(ages), np.zeros_like(ages)
+        
+        return interp_ages_batch(*columns, np.ascontiguousarray(ages, dtype=np.float64))
+    
+    def get_statistics_by_ages(self, ages_weeks: np.ndarray,
+                               min_kg: float = 105,
+                               max_kg: float = 115) -> dict:
+        """
+        Versión vectorizada de `get_statistics_by_age`: mismas claves,
+        pero cada valor es un array con una entrada por edad.
+        """
+        ages = np.asarray(ages_weeks, dtype=np.float64)
+        
+        if self.weight_df.empty:
+            weight_mean = self._estimate_weight(ages)
+            weight_sd = np.full_like(ages, 5.0)
+        else:
+            weight_mean, weight_sd = self._interpolate_batch(self._weight_columns, ages)
+        
+        if self.consumption_df.empty:
+            consumption_mean = self._estimate_consumption(ages)
+            consumption_sd = np.full_like(ages, 2.0)
+        else:
+            consumption_mean, consumption_sd = self._interpolate_batch(
+                self._consumption_columns, ages
+            )
+        
+        # Misma fórmula que `range_pct`, con el erf vectorizado de scipy
+        # (incluido el caso sd = 0: 100 o 0 según si la media está en rango).
+        scaled_sd = weight_sd * SQRT2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ideal_range_pct = 50.0 * (
+                erf((max_kg - weight_mean) / scaled_sd) - erf((min_kg - weight_mean) / scaled_sd)
+            )
+        in_range = (min_kg <= weight_mean) & (weight_mean <= max_kg)
+        ideal_range_pct = np.where(scaled_sd == 0, np.where(in_range, 100.0, 0.0), ideal_range_pct)
+        
+        return {
+            "age_weeks": ages,
+            "weight_mean_kg": weight_mean,
+            "weight_sd_kg": weight_sd,
+            "consumption_mean_kg": consumption_mean,
+            "consumption_sd_kg": consumption_sd,
+            "ideal_range_percentage": ideal_range_pct
+        }
     
     def get_statistics_by_age(self, age_weeks: float) -> dict:
         """Retorna estadísticas completas para una edad."""
@@ -0,0 +1,108 @@
+"""
+biological_kernels.py
+=====================
+
+Kernels de interpolación de las tablas biológicas (peso / consumo por
+edad), compilados con Numba cuando está disponible (ver `src.utils.jit`).
+
+Las tablas son arrays (edad, media, sd) ordenados por edad, como los que
+guarda `BiologicalDataManager`.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from src.utils.jit import njit, prange
+
+SQRT2 = math.sqrt(2.0)
+
+
+@njit(cache=True)
+def _interp_between(ages, means, sds, age, lo, hi):
+    """Interpolación lineal de media y sd entre las filas `lo` y `hi`."""
+    factor = (age - ages[lo]) / (ages[hi] - ages[lo])
+    mean = means[lo] + factor * (means[hi] - means[lo])
+    sd = sds[lo] + factor * (sds[hi] - sds[lo])
+    return mean, sd
+
+
+@njit(cache=True)
+def interp_age(ages, means, sds, age, hint):
+    """
+    Media y sd interpoladas para una edad.
+
+    Fuera del rango de la tabla se devuelve la primera / última fila.
+    Dentro, el tramo se busca por "hunt" (Numerical Recipes §3.1.1):
+    desde el tramo `hint` se avanza con saltos 1, 2, 4, ... hasta
+    acotar la edad y se termina por bisección. Con edades consultadas en
+    orden creciente, el tramo suele estar a uno o dos pasos de `hint`.
+
+    Returns:
+        (mean, sd, new_hint) con `new_hint` el tramo encontrado.
+    """
+    n = ages.shape[0]
+    if age <= ages[0]:
+        return means[0], sds[0], 0
+    if age >= ages[n - 1]:
+        return means[n - 1], sds[n - 1], max(n - 2, 0)
+
+    # Invariante al terminar: ages[lo] < age <= ages[hi], hi = lo + 1.
+    j = min(max(hint, 0), n - 2)
+    step = 1
+    if ages[j] < age:
+        lo = j
+        hi = j + 1
+        while hi < n - 1 and ages[hi] < age:
+            lo = hi
+            step *= 2
+            hi = min(lo + step, n - 1)
+    else:
+        hi = j
+        lo = j - 1
+        while lo > 0 and ages[lo] >= age:
+            hi = lo
+            step *= 2
+            lo = max(hi - step, 0)
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if ages[mid] < age:
+            lo = mid
+        else:
+            hi = mid
+
+    mean, sd = _interp_between(ages, means, sds, age, lo, hi)
+    return mean, sd, lo
+
+
+@njit(cache=True, parallel=True)
+def interp_ages_batch(ages, means, sds, query_ages):
+    """
+    Versión por lotes de `interp_age`: media y sd para cada edad de
+    `query_ages`, en paralelo.
+    """
+    m = query_ages.shape[0]
+    out_mean = np.empty(m, dtype=np.float64)
+    out_sd = np.empty(m, dtype=np.float64)
+    for i in prange(m):
+        mean, sd, _ = interp_age(ages, means, sds, query_ages[i], 0)
+        out_mean[i] = mean
+        out_sd[i] = sd
+    return out_mean, out_sd
+
+
+@njit(cache=True)
+def range_pct(mean, sd, lo, hi):
+    """
+    Porcentaje (0-100) de una normal (mean, sd) que cae en [lo, hi]:
+    50·(erf((hi-mean)/(sd·√2)) - erf((lo-mean)/(sd·√2))).
+
+    Con sd = 0 todos los porcos pesan `mean`: 100 si está en [lo, hi] y 0 si no.
+    """
+    s = sd * SQRT2
+    if s == 0.0:
+        return 100.0 if lo <= mean <= hi else 0.0
+    return 50.0 * (math.erf((hi - mean) / s) - math.erf((lo - mean) / s))
@@ -0,0 +1,77 @@
+"""
+bootstrap.py
+============
+
+Construcción de las entidades de dominio (`Farm`, `Slaughterhouse`,
+`Transport`, `BiologicalDataManager`) a partir de los datos de `data/`.
+
+Lo comparten `main.py`, `run_dashboard.py` y `run_map.py`.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from src.models.Farm import Farm
+from src.models.Slaughterhouse import Slaughterhouse
+from src.models.Transport import Transport
+from src.utils.BiologicalDataManager import BiologicalDataManager
+from src.utils.data_loader import (
+    DataLoader,
+    FARM_COLUMNS,
+    SLAUGHTERHOUSE_COLUMNS,
+    TRANSPORT_COLUMNS,
+)
+
+
+def build_farms(farms_df: pd.DataFrame) -> List[Farm]:
+    """Crea una `Farm` por fila a partir de las columnas del DataFrame."""
+    cols = [farms_df[col].tolist() for col in FARM_COLUMNS]
+    return [Farm(*values) for values in zip(*cols)]
+
+
+def build_slaughterhouses(slaughterhouses_df: pd.DataFrame) -> List[Slaughterhouse]:
+    """Crea un `Slaughterhouse` por fila a partir de las columnas del DataFrame."""
+    cols = [slaughterhouses_df[col].tolist() for col in SLAUGHTERHOUSE_COLUMNS]
+    return [Slaughterhouse(*values) for values in zip(*cols)]
+
+
+def build_transports(transports_df: pd.DataFrame) -> List[Transport]:
+    """Crea un `Transport` por fila a partir de las columnas del DataFrame."""
+    cols = [transports_df[col].tolist() for col in TRANSPORT_COLUMNS]
+    return [Transport(*values) for values in zip(*cols)]
+
+
+def build_domain_objects(
+    data_dir: str = "data",
+    sites_only: bool = False,
+    use_cache: bool = True,
+) -> Tuple[List[Farm], List[Slaughterhouse], List[Transport], Optional[BiologicalDataManager]]:
+    """
+    Carga datos y construye farms, slaughterhouses, transports y bio_manager.
+
+    Con `sites_only=True` solo se leen granjas y escorxadores (lo que
+    necesita el mapa); transports sale vacío y bio_manager es None.
+    `use_cache` se pasa a `DataLoader`.
+    """
+    loader = DataLoader(data_dir, use_cache=use_cache)
+
+    if sites_only:
+        farms_df, slaughterhouses_df = loader.load_sites()
+        return build_farms(farms_df), build_slaughterhouses(slaughterhouses_df), [], None
+
+    farms_df, slaughterhouses_df, transports_df = loader.load_all_data()
+
+    bio_manager = BiologicalDataManager(
+        loader.get_consumption_data(),
+        loader.get_weight_data(),
+    )
+
+    return (
+        build_farms(farms_df),
+        build_slaughterhouses(slaughterhouses_df),
+        build_transports(transports_df),
+        bio_manager,
+    )
@@ -1,13 +1,62 @@
 import pandas as pd
 import os
-from typing import Dict, List, Tuple
-import sqlite3
+import hashlib
+import pickle
+import sys
+from typing import Dict, Optional, Tuple
+
+# Esquema de cada CSV: columnas obligatorias y su dtype final. El orden
+# coincide con los campos posicionales de Farm / Slaughterhouse / Transport.
+# Contadores en int32 (de sobra para los tamaños de granja). Coordenadas,
+# precios y costes siguen en float64: las coordenadas alimentan las
+# distancias de las rutas y los precios se acumulan en los KPIs económicos.
+FARM_DTYPES = {
+    'farm_id': str, 'name': str,
+    'lat': 'float64', 'lon': 'float64',
+    'inventory_pigs': 'int32', 'avg_weight_kg': 'float64',
+    'growth_rate_kg_per_week': 'float64', 'age_weeks': 'int32',
+    'price_per_kg': 'float64', 'consumption_pigs': 'float64',
+    'capacity': 'int32',
+}
+SLAUGHTERHOUSE_DTYPES = {
+    'slaughterhouse_id': str, 'name': str,
+    'lat': 'float64', 'lon': 'float64',
+    'capacity_per_day': 'int32', 'price_per_kg': 'float64',
+    'penalty_15_min': 'float64', 'penalty_15_max': 'float64',
+    'penalty_20_min': 'float64', 'penalty_20_max': 'float64',
+}
+TRANSPORT_DTYPES = {
+    'transport_id': str, 'type': str,
+    'capacity_tons': 'float64', 'cost_per_km': 'float64',
+    'max_hours_per_week': 'float64', 'fixed_weekly_cost': 'float64',
+}
+
+FARM_COLUMNS = tuple(FARM_DTYPES)
+SLAUGHTERHOUSE_COLUMNS = tuple(SLAUGHTERHOUSE_DTYPES)
+TRANSPORT_COLUMNS = tuple(TRANSPORT_DTYPES)
+
+# Columnas de los Excel de consumo y peso por edad.
+AGE_TABLE_COLUMNS = ["age of pigs in week", "mean", "sd"]
+
+# Ficheros que lee `load_all_data`; su tamaño y mtime forman la clave de la caché.
+SOURCE_FILES = (
+    "farms 1.csv",
+    "slaughterhouses 1.csv",
+    "transports 1.csv",
+    "Consumption 1.xlsx",
+    "weight 1.xlsx",
+)
+# Carpeta de la caché; se puede cambiar con la variable de entorno HACKEPS_CACHE_DIR.
+CACHE_DIR = os.environ.get("HACKEPS_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "hackeps_repte_porcs"
+)
 
 class DataLoader:
     """Carga y valida datos desde CSV para la simulación logística."""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", use_cache: bool = True):
         self.data_dir = data_dir
+        self.use_cache = use_cache
         self.farms = None
         self.slaughterhouses = None
         self.transports = None
@@ -15,13 +64,23 @@ class DataLoader:
         self.weight_data = None
     
     def load_all_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        """Carga todos los CSV necesarios."""
+        """
+        Carga todos los CSV necesarios.
+
+        Con `use_cache` el resultado se guarda en un pickle en `CACHE_DIR`
+        cuya clave depende del tamaño y la fecha de modificación de
+        `SOURCE_FILES`; mientras no cambien, las siguientes cargas se
+        saltan el parseo.
+        """
         try:
-            self.farms = self._load_farms()
-            self.slaughterhouses = self._load_slaughterhouses()
-            self.transports = self._load_transports()
-            self.consumption_data = self._load_consumption()
-            self.weight_data = self._load_weight()
+            cache_path = self._cache_path() if self.use_cache else None
+            if not self._read_cache(cache_path):
+                self.farms = self._load_farms()
+                self.slaughterhouses = self._load_slaughterhouses()
+                self.transports = self._load_transports()
+                self.consumption_data = self._load_consumption()
+                self.weight_data = self._load_weight()
+                self._write_cache(cache_path)
             
             print("✓ Datos cargados exitosamente")
             print(f"  - {len(self.farms)} granjas")
@@ -39,85 +98,136 @@ class DataLoader:
             print(f"✗ Error inesperado: {e}")
             raise
     
-    def _load_farms(self) -> pd.DataFrame:
-        """Carga y valida el CSV de granjas."""
-        file_path = os.path.join(self.data_dir, "farms 1.csv")
-        df = pd.read_csv(file_path)
+    def _cache_path(self) -> Optional[str]:
+        """
+        Ruta del pickle para el estado actual de los ficheros de datos y del
+        esquema (None si falta algún fichero).
+        """
+        key = hashlib.blake2b(digest_size=8, usedforsecurity=False)
+        # El esquema y las versiones de Python / pandas forman parte de la
+        # clave: si cambian, los pickles anteriores no valen.
+        key.update(repr((FARM_DTYPES, SLAUGHTERHOUSE_DTYPES, TRANSPORT_DTYPES)).encode())
+        key.update(f"{tuple(sys.version_info)}:{pd.__version__}".encode())
+        for name in SOURCE_FILES:
+            path = os.path.abspath(os.path.join(self.data_dir, name))
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            key.update(f"{path}:{st.st_size}:{st.st_mtime_ns}".encode())
+        return os.path.join(CACHE_DIR, f"{key.hexdigest()}.pkl")
+    
+    def _read_cache(self, cache_path: Optional[str]) -> bool:
+        """Carga los cinco DataFrames desde la caché. Retorna True si lo consigue."""
+        if cache_path is None or not os.path.exists(cache_path):
+            return False
+        # Un pickle corrupto o de otra versión de pandas puede fallar con
+        # casi cualquier excepción; en ese caso se vuelve a leer de disco.
+        try:
+            with open(cache_path, "rb") as fh:
+                (self.farms, self.slaughterhouses, self.transports,
+                 self.consumption_data, self.weight_data) = pickle.load(fh)
+        except Exception:
+            return False
+        return True
+    
+    def _write_cache(self, cache_path: Optional[str]) -> None:
+        """Guarda los cinco DataFrames en la caché (si no se puede, se ignora)."""
+        if cache_path is None:
+            return
+        data = (self.farms, self.slaughterhouses, self.transports,
+                self.consumption_data, self.weight_data)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
+    def load_sites(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Carga solo granjas y escorxadores (sin transportes ni datos biológicos)."""
+        self.farms = self._load_farms()
+        self.slaughterhouses = self._load_slaughterhouses()
         
-        required_cols = [
-            'farm_id', 'name', 'lat', 'lon', 'inventory_pigs',
-            'avg_weight_kg', 'growth_rate_kg_per_week', 'age_weeks',
-            'price_per_kg', 'consumption_pigs', 'capacity'
-        ]
+        print("✓ Datos cargados exitosamente")
+        print(f"  - {len(self.farms)} granjas")
+        print(f"  - {len(self.slaughterhouses)} escorxadores")
+        
+        return self.farms, self.slaughterhouses
+    
+    @staticmethod
+    def _validate_schema(df: pd.DataFrame, dtypes: Dict[str, object],
+                         table: str, label: str) -> pd.DataFrame:
+        """
+        Valida columnas obligatorias, descarta filas con nulos y convierte
+        todo el DataFrame a los dtypes del esquema de una sola vez.
+        """
+        required_cols = list(dtypes)
         
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
-            raise ValueError(f"Columnas faltantes en farms: {missing_cols}")
+            raise ValueError(f"Columnas faltantes en {table}: {missing_cols}")
         
-        df['lat'] = pd.to_numeric(df['lat'], errors='coerce')
-        df['lon'] = pd.to_numeric(df['lon'], errors='coerce')
-        df['inventory_pigs'] = pd.to_numeric(df['inventory_pigs'], errors='coerce')
-        df['avg_weight_kg'] = pd.to_numeric(df['avg_weight_kg'], errors='coerce')
-        df['growth_rate_kg_per_week'] = pd.to_numeric(df['growth_rate_kg_per_week'], errors='coerce')
-        df['age_weeks'] = pd.to_numeric(df['age_weeks'], errors='coerce')
-        df['price_per_kg'] = pd.to_numeric(df['price_per_kg'], errors='coerce')
-        df['consumption_pigs'] = pd.to_numeric(df['consumption_pigs'], errors='coerce')
-        df['capacity'] = pd.to_numeric(df['capacity'], errors='coerce')
+        # read_csv ya devuelve numéricas las columnas limpias; solo las que
+        # quedaron como texto (valores sucios) se convierten, todas de golpe.
+        dirty_cols = [
+            col for col, dtype in dtypes.items()
+            if dtype is not str and not pd.api.types.is_numeric_dtype(df[col])
+        ]
+        if dirty_cols:
+            df[dirty_cols] = df[dirty_cols].apply(pd.to_numeric, errors='coerce')
         
-        if df[required_cols].isnull().any().any():
-            print("⚠ Advertencia: Hay valores nulos en las granjas")
-            df = df.dropna(subset=required_cols)
+        n_rows = len(df)
+        df = df.dropna(subset=required_cols)
+        if len(df) < n_rows:
+            print(f"⚠ Advertencia: Hay valores nulos en {label} "
+                  f"({n_rows - len(df)} filas descartadas)")
         
-        return df
+        # Las columnas enteras se redondean antes del cast: `astype`
+        # truncaría en silencio valores como 16.6.
+        int_cols = [
+            col for col, dtype in dtypes.items()
+            if dtype is not str and pd.api.types.is_integer_dtype(dtype)
+        ]
+        fractional = (df[int_cols] % 1 != 0).any()
+        fractional_cols = fractional[fractional].index.tolist()
+        if fractional_cols:
+            print(f"⚠ Advertencia: Valores no enteros en {label} "
+                  f"({', '.join(fractional_cols)}); se redondean")
+            df[fractional_cols] = df[fractional_cols].round()
+        
+        return df.astype(dtypes)
+    
+    @staticmethod
+    def _read_csv(file_path: str, dtypes: Dict[str, object]) -> pd.DataFrame:
+        """
+        Lee un CSV fijando como texto las columnas de texto del esquema,
+        para que read_csv no tenga que inferir su tipo.
+        """
+        text_cols = [col for col, dtype in dtypes.items() if dtype is str]
+        return pd.read_csv(file_path, dtype=dict.fromkeys(text_cols, str))
+    
+    def _load_farms(self) -> pd.DataFrame:
+        """Carga y valida el CSV de granjas."""
+        file_path = os.path.join(self.data_dir, "farms 1.csv")
+        df = self._read_csv(file_path, FARM_DTYPES)
+        return self._validate_schema(df, FARM_DTYPES, "farms", "las granjas")
     
     def _load_slaughterhouses(self) -> pd.DataFrame:
         """Carga y valida el CSV de escorxadores."""
         file_path = os.path.join(self.data_dir, "slaughterhouses 1.csv")
-        df = pd.read_csv(file_path)
-        
-        required_cols = [
-            'slaughterhouse_id', 'name', 'lat', 'lon', 'capacity_per_day',
-            'price_per_kg', 'penalty_15_min', 'penalty_15_max',
-            'penalty_20_min', 'penalty_20_max'
-        ]
-        
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            raise ValueError(f"Columnas faltantes en escorxadores: {missing_cols}")
-        
-        numeric_cols = [col for col in required_cols if col != 'slaughterhouse_id' and col != 'name']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        if df[required_cols].isnull().any().any():
-            print("⚠ Advertencia: Hay valores nulos en los escorxadores")
-            df = df.dropna(subset=required_cols)
-        
-        return df
+        df = self._read_csv(file_path, SLAUGHTERHOUSE_DTYPES)
+        return self._validate_schema(
+            df, SLAUGHTERHOUSE_DTYPES, "escorxadores", "los escorxadores"
+        )
     
     def _load_transports(self) -> pd.DataFrame:
         """Carga y valida el CSV de transportes."""
         file_path = os.path.join(self.data_dir, "transports 1.csv")
-        df = pd.read_csv(file_path)
-        
-        required_cols = [
-            'transport_id', 'type', 'capacity_tons', 'cost_per_km',
-            'max_hours_per_week', 'fixed_weekly_cost'
-        ]
-        
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            raise ValueError(f"Columnas faltantes en transportes: {missing_cols}")
-        
-        numeric_cols = ['capacity_tons', 'cost_per_km', 'max_hours_per_week', 'fixed_weekly_cost']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        if df[required_cols].isnull().any().any():
-            print("⚠ Advertencia: Hay valores nulos en los transportes")
-            df = df.dropna(subset=required_cols)
-        
-        return df
+        df = self._read_csv(file_path, TRANSPORT_DTYPES)
+        return self._validate_schema(df, TRANSPORT_DTYPES, "transportes", "los transportes")
     
     def _load_consumption(self) -> pd.DataFrame:
         """
@@ -132,25 +242,7 @@ class DataLoader:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"No se encontró el fichero de consumo: {file_path}")
 
-        raw = pd.read_excel(file_path, header=None)
-
-        header = raw.iloc[0].tolist()
-        data = raw.iloc[1:].copy()
-        data.columns = [
-            "age of pigs in week",
-            "mean",
-            "sd",
-        ]
-
-        data["age of pigs in week"] = pd.to_numeric(
-            data["age of pigs in week"], errors="coerce"
-        )
-        data["mean"] = pd.to_numeric(data["mean"], errors="coerce")
-        data["sd"] = pd.to_numeric(data["sd"], errors="coerce")
-
-        data = data.dropna(subset=["age of pigs in week", "mean", "sd"])
-
-        return data
+        return self._load_age_table(file_path)
 
     def _load_weight(self) -> pd.DataFrame:
         """
@@ -163,25 +255,18 @@ class DataLoader:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"No se encontró el fichero de peso: {file_path}")
 
-        raw = pd.read_excel(file_path, header=None)
+        return self._load_age_table(file_path)
 
-        header = raw.iloc[0].tolist()
-        data = raw.iloc[1:].copy()
-        data.columns = [
-            "age of pigs in week",
-            "mean",
-            "sd",
-        ]
-
-        data["age of pigs in week"] = pd.to_numeric(
-            data["age of pigs in week"], errors="coerce"
-        )
-        data["mean"] = pd.to_numeric(data["mean"], errors="coerce")
-        data["sd"] = pd.to_numeric(data["sd"], errors="coerce")
-
-        data = data.dropna(subset=["age of pigs in week", "mean", "sd"])
-
-        return data
+    @staticmethod
+    def _load_age_table(file_path: str) -> pd.DataFrame:
+        """
+        Lee una tabla (edad, mean, sd) de Excel con la primera fila como
+        cabecera y descarta las filas no numéricas. Parsear el .xlsx es
+        lo más lento de la carga; `load_all_data` lo evita con su caché.
+        """
+        data = pd.read_excel(file_path, header=0, names=AGE_TABLE_COLUMNS)
+        data = data.apply(pd.to_numeric, errors="coerce")
+        return data.dropna(subset=AGE_TABLE_COLUMNS)
 
     def get_consumption_data(self) -> pd.DataFrame:
         """Retorna el DataFrame de consumo biológico."""
@@ -0,0 +1,64 @@
+"""
+geo.py
+======
+
+Utilidades geográficas: distancia haversine entre coordenadas GPS.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_matrix(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+    dtype=np.float32,
+) -> np.ndarray:
+    """
+    Matriz de distancias en km entre dos conjuntos de puntos.
+
+    Devuelve un array de forma (len(lat1), len(lat2)) donde el elemento
+    [i, j] es la distancia entre el punto i del primer conjunto y el
+    punto j del segundo.
+    """
+    phi1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    phi2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    return haversine_matrix_rad(
+        phi1, np.radians(np.asarray(lon1, dtype=np.float64)), np.cos(phi1),
+        phi2, np.radians(np.asarray(lon2, dtype=np.float64)), np.cos(phi2),
+        dtype=dtype,
+    )
+
+
+def haversine_matrix_rad(
+    lat1_rad: np.ndarray,
+    lon1_rad: np.ndarray,
+    cos_lat1: np.ndarray,
+    lat2_rad: np.ndarray,
+    lon2_rad: np.ndarray,
+    cos_lat2: np.ndarray,
+    dtype=np.float32,
+) -> np.ndarray:
+    """
+    Igual que `haversine_matrix`, pero con las coordenadas ya en radianes
+    y cos(lat) precalculado por punto (ver `Farm._cos_lat`), de modo que
+    solo quedan los senos de las diferencias.
+    """
+    phi1 = np.asarray(lat1_rad, dtype=np.float64)[:, None]
+    phi2 = np.asarray(lat2_rad, dtype=np.float64)[None, :]
+    lam1 = np.asarray(lon1_rad, dtype=np.float64)[:, None]
+    lam2 = np.asarray(lon2_rad, dtype=np.float64)[None, :]
+    cos1 = np.asarray(cos_lat1, dtype=np.float64)[:, None]
+    cos2 = np.asarray(cos_lat2, dtype=np.float64)[None, :]
+
+    a = np.sin((phi2 - phi1) / 2) ** 2 + cos1 * cos2 * np.sin((lam2 - lam1) / 2) ** 2
+    # 2·asin(√a) equivale a 2·atan2(√a, √(1-a)) para a en [0, 1] y ahorra
+    # una raíz y la atan2. `a` puede pasar de 1 por redondeo en puntos antípodas.
+    np.clip(a, 0.0, 1.0, out=a)
+    c = 2 * np.arcsin(np.sqrt(a, out=a))
+    return (EARTH_RADIUS_KM * c).astype(dtype, copy=False)
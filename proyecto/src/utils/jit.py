@@ -0,0 +1,33 @@
+"""
+jit.py
+======
+
+Acceso opcional a Numba.
+
+Si `numba` está instalado, `njit` es el decorador real y los kernels se
+compilan a código máquina. Si no lo está, `njit` devuelve la función tal
+cual y los mismos kernels se ejecutan en Python puro (`prange` pasa a
+ser `range`).
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depende del entorno
+    HAS_NUMBA = False
+
+    # Sin Numba los bucles `prange` son bucles normales.
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Sustituto de `numba.njit` que no compila nada."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -5,13 +5,15 @@ metrics.py
 Pequeña librería de KPIs para analizar los resultados de la simulación.
 
 Todos los métodos funcionan con un `pd.DataFrame` de eventos
-como el que devuelve `Simulator.run()`.
+como el que devuelve `Simulator.run()`; `compute_net_profit` acepta
+también el dict de columnas de `Simulator.run(return_df=False)`.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 
+import numpy as np
 import pandas as pd
 
 
@@ -23,26 +25,29 @@ def _parse_capacity_pct(series: pd.Series) -> float:
     if series is None or series.empty:
         return 0.0
 
-    def to_float(x):
-        if x is None:
-            return None
-        if isinstance(x, (int, float)):
-            return float(x)
-        s = str(x).strip()
-        if s.endswith("%"):
-            s = s[:-1]
-        try:
-            return float(s)
-        except ValueError:
-            return None
-
-    vals = series.map(to_float)
+    if pd.api.types.is_numeric_dtype(series):
+        vals = series.astype("float64")
+    else:
+        text = series.astype("string").str.strip().str.removesuffix("%")
+        vals = pd.to_numeric(text, errors="coerce")
+
     vals = vals.dropna()
     if vals.empty:
         return 0.0
     return float(vals.mean())
 
 
+# Columnas que `compute_global_kpis` suma directamente.
+KPI_SUM_COLUMNS = [
+    "pigs_delivered",
+    "distance_km",
+    "time_hours",
+    "transport_cost",
+    "revenue",
+    "penalty_applied",
+]
+
+
 def compute_global_kpis(events: pd.DataFrame) -> Dict[str, Any]:
     """
     Calcula algunos indicadores básicos a partir del log de rutas.
@@ -80,18 +85,31 @@ def compute_global_kpis(events: pd.DataFrame) -> Dict[str, Any]:
             "avg_capacity_utilization_pct": 0.0,
         }
 
-    total_pigs = float(events["pigs_delivered"].sum())
-    total_distance = float(events["distance_km"].sum())
-    total_time = float(events["time_hours"].sum())
-    total_cost = float(events.get("transport_cost", 0.0).sum())
-    total_revenue = float(events.get("revenue", 0.0).sum())
-    total_penalty = float(events.get("penalty_applied", 0.0).sum())
+    # Todas las sumas en una sola pasada y siempre en float64, aunque las
+    # columnas vengan en float32; las opcionales que falten suman 0.
+    sum_columns = [col for col in KPI_SUM_COLUMNS if col in events.columns]
+    totals = (
+        events[sum_columns]
+        .astype(np.float64, copy=False)
+        .sum()
+        .reindex(KPI_SUM_COLUMNS, fill_value=0.0)
+    )
+    total_pigs = float(totals["pigs_delivered"])
+    total_distance = float(totals["distance_km"])
+    total_time = float(totals["time_hours"])
+    total_cost = float(totals["transport_cost"])
+    total_revenue = float(totals["revenue"])
+    total_penalty = float(totals["penalty_applied"])
     num_routes = int(len(events))
 
     if "avg_weight_kg" in events.columns and total_pigs > 0:
-        weighted_weight = (events["avg_weight_kg"] * events["pigs_delivered"]).sum()
-        avg_weight = float(weighted_weight / total_pigs)
-        total_kg = float((events["avg_weight_kg"] * events["pigs_delivered"]).sum())
+        total_kg = float(
+            (
+                events["avg_weight_kg"].to_numpy(dtype=np.float64)
+                * events["pigs_delivered"].to_numpy(dtype=np.float64)
+            ).sum()
+        )
+        avg_weight = total_kg / total_pigs
     else:
         avg_weight = 0.0
         total_kg = 0.0
@@ -125,30 +143,70 @@ def compute_global_kpis(events: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-def compute_daily_kpis(events: pd.DataFrame) -> pd.DataFrame:
+def compute_net_profit(events: Union[pd.DataFrame, Dict[str, List[Any]], None]) -> float:
     """
-    Devuelve KPIs agregados por día.
+    Beneficio neto (ingresos - coste de transporte) de un log de eventos,
+    sin necesidad de construir el DataFrame.
+    """
+    if events is None or "revenue" not in events:
+        return 0.0
+    return float(np.sum(events["revenue"])) - float(np.sum(events["transport_cost"]))
+
+
+# Agregaciones diarias: columna de salida -> (columna de eventos, función).
+DAILY_AGGREGATIONS = {
+    "pigs_delivered": ("pigs_delivered", "sum"),
+    "distance_km": ("distance_km", "sum"),
+    "time_hours": ("time_hours", "sum"),
+    "transport_cost": ("transport_cost", "sum"),
+    "revenue": ("revenue", "sum"),
+    "penalty_applied": ("penalty_applied", "sum"),
+    "routes": ("route_id", "nunique"),
+}
+
+
+def compute_daily_frame(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrupa los eventos por día en una sola pasada con todas las
+    agregaciones de `DAILY_AGGREGATIONS` (las que tengan columna en
+    `events`). Es la base de `compute_daily_kpis` y de los gráficos
+    del dashboard.
     """
     if events is None or events.empty:
         return pd.DataFrame()
 
-    grouped = (
-        events.groupby("day")
-        .agg(
-            pigs_delivered=("pigs_delivered", "sum"),
-            distance_km=("distance_km", "sum"),
-            time_hours=("time_hours", "sum"),
-            transport_cost=("transport_cost", "sum"),
-            revenue=("revenue", "sum"),
-            penalty_applied=("penalty_applied", "sum"),
-            routes=("route_id", "nunique"),
-        )
-        .reset_index()
-    )
+    aggregations = {
+        name: agg for name, agg in DAILY_AGGREGATIONS.items() if agg[0] in events.columns
+    }
+    return events.groupby("day").agg(**aggregations).reset_index()
+
 
-    grouped["net_profit"] = grouped["revenue"] - grouped["transport_cost"]
-    grouped["avg_pigs_per_route"] = grouped["pigs_delivered"] / grouped["routes"].replace(0, pd.NA)
-    grouped["avg_distance_per_route_km"] = grouped["distance_km"] / grouped["routes"].replace(0, pd.NA)
-    grouped["avg_time_per_route_h"] = grouped["time_hours"] / grouped["routes"].replace(0, pd.NA)
+def compute_daily_kpis(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Devuelve KPIs agregados por día: las columnas de `compute_daily_frame`
+    más beneficio neto y medias por ruta.
+    """
+    grouped = compute_daily_frame(events)
+    if grouped.empty:
+        return grouped
+
+    if "revenue" in grouped.columns and "transport_cost" in grouped.columns:
+        grouped["net_profit"] = grouped["revenue"] - grouped["transport_cost"]
+    if "routes" in grouped.columns:
+        # Días sin rutas: NaN, sin pasar por Series intermedias ni dtype object.
+        routes = grouped["routes"].to_numpy(dtype=np.float64)
+        has_routes = routes != 0
+        for column, average in (
+            ("pigs_delivered", "avg_pigs_per_route"),
+            ("distance_km", "avg_distance_per_route_km"),
+            ("time_hours", "avg_time_per_route_h"),
+        ):
+            if column in grouped.columns:
+                out = np.full(len(routes), np.nan)
+                np.divide(
+                    grouped[column].to_numpy(dtype=np.float64), routes,
+                    out=out, where=has_routes,
+                )
+                grouped[average] = out
 
     return grouped
@@ -0,0 +1,62 @@
+"""
+Configuración común de los tests: los módulos se importan como `src.*`
+desde la raíz de `proyecto`, igual que en `main.py`.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+
+@pytest.fixture
+def data_dir() -> str:
+    """Carpeta `data/` del proyecto."""
+    return os.path.join(PROJECT_DIR, "data")
+
+
+@pytest.fixture
+def domain_objects(data_dir):
+    """(farms, slaughterhouses, transports, bio_manager) recién construidos."""
+    from src.utils.bootstrap import build_domain_objects
+
+    # La carga imprime un resumen por consola que no interesa aquí; sin
+    # caché para no escribir en la carpeta del usuario.
+    with contextlib.redirect_stdout(io.StringIO()):
+        return build_domain_objects(data_dir, use_cache=False)
+
+
+@pytest.fixture
+def route_instance():
+    """
+    Generador de instancias aleatorias para los kernels del `Router`:
+    granjas y escorxadores por Cataluña, con sus matrices y órdenes.
+    """
+    from src.utils.geo import haversine_matrix
+
+    def make(rng, n_farms=40, n_sh=4):
+        farm_lat = rng.uniform(40.6, 42.6, n_farms)
+        farm_lon = rng.uniform(0.3, 3.2, n_farms)
+        sh_lat = rng.uniform(40.6, 42.6, n_sh)
+        sh_lon = rng.uniform(0.3, 3.2, n_sh)
+        ff_dist = haversine_matrix(farm_lat, farm_lon, farm_lat, farm_lon, dtype=np.float64)
+        fs_dist = haversine_matrix(farm_lat, farm_lon, sh_lat, sh_lon, dtype=np.float64)
+        return {
+            "remaining_pigs": rng.integers(0, 250, n_farms).astype(np.int64),
+            "remaining_cap_sh": rng.integers(100, 800, n_sh).astype(np.int64),
+            "weights": rng.uniform(90.0, 125.0, n_farms),
+            "ff_dist": ff_dist,
+            "fs_dist": fs_dist,
+            "ff_order": np.argsort(ff_dist, axis=1, kind="stable"),
+            "fs_order": np.argsort(fs_dist.T, axis=1, kind="stable"),
+        }
+
+    return make
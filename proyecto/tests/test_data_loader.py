@@ -0,0 +1,98 @@
+"""
+Caché en pickle de `DataLoader.load_all_data`.
+"""
+
+import contextlib
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils import data_loader
+from src.utils.data_loader import DataLoader
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Cada test usa su propia carpeta de caché."""
+    path = tmp_path / "cache"
+    monkeypatch.setattr(data_loader, "CACHE_DIR", str(path))
+    return path
+
+
+def _load(data_dir, use_cache=True):
+    loader = DataLoader(data_dir, use_cache=use_cache)
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader.load_all_data()
+    return loader
+
+
+def _frames(loader):
+    return (loader.farms, loader.slaughterhouses, loader.transports,
+            loader.consumption_data, loader.weight_data)
+
+
+def _assert_same_frames(a, b):
+    for x, y in zip(_frames(a), _frames(b)):
+        pd.testing.assert_frame_equal(x, y)
+
+
+def test_cache_round_trip(data_dir, cache_dir):
+    fresh = _load(data_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached = _load(data_dir)
+    _assert_same_frames(fresh, cached)
+    _assert_same_frames(fresh, _load(data_dir, use_cache=False))
+
+
+def test_corrupt_cache_falls_back_to_source(data_dir, cache_dir):
+    fresh = _load(data_dir)
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_bytes(b"no es un pickle")
+
+    _assert_same_frames(fresh, _load(data_dir))
+    # La carga vuelve a escribir una caché válida.
+    _assert_same_frames(fresh, _load(data_dir))
+
+
+def test_cache_key_changes_with_sources(data_dir, tmp_path):
+    copy_dir = tmp_path / "data"
+    copy_dir.mkdir()
+    for name in data_loader.SOURCE_FILES:
+        (copy_dir / name).write_bytes(open(os.path.join(data_dir, name), "rb").read())
+
+    loader = DataLoader(str(copy_dir))
+    key = loader._cache_path()
+    assert key is not None
+
+    farms_csv = copy_dir / data_loader.SOURCE_FILES[0]
+    farms_csv.write_bytes(farms_csv.read_bytes() + b"\n")
+    assert loader._cache_path() != key
+
+    farms_csv.unlink()
+    assert loader._cache_path() is None
+
+
+def test_no_cache_written_without_use_cache(data_dir, cache_dir):
+    _load(data_dir, use_cache=False)
+    assert not cache_dir.exists()
+
+
+def test_fractional_integer_columns_are_rounded(data_dir, tmp_path):
+    copy_dir = tmp_path / "data"
+    copy_dir.mkdir()
+    for name in data_loader.SOURCE_FILES:
+        (copy_dir / name).write_bytes(open(os.path.join(data_dir, name), "rb").read())
+
+    farms_csv = copy_dir / data_loader.SOURCE_FILES[0]
+    farms = pd.read_csv(farms_csv)
+    farms["age_weeks"] = farms["age_weeks"].astype(float)
+    farms.loc[0, "age_weeks"] = 16.6
+    farms.to_csv(farms_csv, index=False)
+
+    loader = _load(str(copy_dir), use_cache=False)
+    assert loader.farms["age_weeks"].iloc[0] == 17
+    assert loader.farms["age_weeks"].dtype == "int32"
+    assert loader.farms["lat"].dtype == "float64"
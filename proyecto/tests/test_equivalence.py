@@ -0,0 +1,178 @@
+"""
+Las optimizaciones deben dar el mismo resultado que la versión directa.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.Farm import LOGISTIC_WEEK_DAYS
+from src.models.FarmArrays import FarmArrays
+from src.simulation.route_kernels import build_route_kernel
+from src.simulation.Simulator import Simulator
+from src.utils.biological_kernels import interp_age, range_pct
+from src.utils.geo import EARTH_RADIUS_KM, haversine_matrix
+
+
+def test_precomputed_distance_matrix_matches_router(domain_objects):
+    farms, slaughterhouses, transports, bio_manager = domain_objects
+    distance_matrix = haversine_matrix(
+        np.array([f.lat for f in farms]),
+        np.array([f.lon for f in farms]),
+        np.array([sh.lat for sh in slaughterhouses]),
+        np.array([sh.lon for sh in slaughterhouses]),
+        dtype=np.float64,
+    )
+
+    own = Simulator(farms, slaughterhouses, transports, bio_manager)
+    snap = own.snapshot()
+    expected = own.run(days=10)
+    own.restore(snap)
+
+    shared = Simulator(
+        farms, slaughterhouses, transports, bio_manager, distance_matrix=distance_matrix
+    )
+    np.testing.assert_allclose(shared.distance_matrix, own.distance_matrix, rtol=1e-12)
+    pd.testing.assert_frame_equal(shared.run(days=10), expected)
+
+
+def test_farm_arrays_match_farm_objects(domain_objects):
+    farms = domain_objects[0]
+    reference = [copy.copy(farm) for farm in farms]
+    arrays = FarmArrays.from_farms(farms)
+
+    arrays.update_growth(3)
+    for farm in reference:
+        farm.update_growth(3)
+
+    assert arrays.avg_weight_kg.tolist() == pytest.approx([f.avg_weight_kg for f in reference])
+    assert arrays.age_weeks.tolist() == pytest.approx([f.age_weeks for f in reference])
+
+    arrays.deliver_pigs(0, 1, 2)
+    reference[0].deliver_pigs(1, 2)
+    for day in range(3 * LOGISTIC_WEEK_DAYS):
+        week = day // LOGISTIC_WEEK_DAYS
+        assert arrays.can_deliver_mask(week).tolist() == [
+            farm.can_deliver_today(week) for farm in reference
+        ]
+
+
+def _greedy_route_reference(
+    remaining_pigs, remaining_cap_sh, weights, ff_dist, fs_dist, ff_order, fs_order,
+    truck_capacity_kg, sh_idx, max_stops, max_hours, current_hours_used, speed_kmh,
+):
+    """
+    Inserción voraz sin poda: en cada parada se evalúan todas las granjas.
+    Los empates se resuelven por el mismo orden de recorrido que el kernel.
+    """
+    stops, pigs = [], []
+    sh_remaining_cap = remaining_cap_sh[sh_idx]
+    remaining_capacity_kg = truck_capacity_kg
+    distance_km = 0.0
+    last_idx = -1
+
+    while len(stops) < max_stops:
+        order = fs_order[sh_idx] if last_idx < 0 else ff_order[last_idx]
+        best = None
+        for f in order:
+            if remaining_pigs[f] <= 0 or f in stops or weights[f] <= 0:
+                continue
+            pigs_possible = min(
+                int(remaining_capacity_kg / weights[f]), remaining_pigs[f], sh_remaining_cap
+            )
+            if pigs_possible <= 0:
+                continue
+            if last_idx < 0:
+                incremental = 2.0 * fs_dist[f, sh_idx]
+            else:
+                incremental = ff_dist[last_idx, f] + fs_dist[f, sh_idx] - fs_dist[last_idx, sh_idx]
+            if best is None or incremental < best[0]:
+                best = (incremental, f, pigs_possible)
+
+        if best is None:
+            break
+        incremental, f, pigs_possible = best
+        if current_hours_used + (distance_km + incremental) / speed_kmh > max_hours:
+            if not stops:
+                return [], [], 0.0
+            break
+
+        stops.append(f)
+        pigs.append(pigs_possible)
+        last_idx = f
+        distance_km += incremental
+        sh_remaining_cap -= pigs_possible
+        remaining_capacity_kg -= pigs_possible * weights[f]
+        remaining_pigs[f] -= pigs_possible
+        if remaining_capacity_kg <= 0 or sh_remaining_cap <= 0:
+            break
+
+    return stops, pigs, distance_km
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("truck_capacity_kg", [2500.0, 20000.0, 60000.0])
+def test_route_pruning_matches_full_scan(route_instance, seed, truck_capacity_kg):
+    inst = route_instance(np.random.default_rng(seed))
+    keys = ("remaining_pigs", "remaining_cap_sh", "weights",
+            "ff_dist", "fs_dist", "ff_order", "fs_order")
+    pruned = [inst[k].copy() for k in keys]
+    full = [inst[k].copy() for k in keys]
+
+    for sh_idx in range(inst["remaining_cap_sh"].size):
+        stops, pigs, distance_km, _ = build_route_kernel(
+            *pruned, truck_capacity_kg, sh_idx, 4, 8.0, 0.0, 60.0
+        )
+        ref_stops, ref_pigs, ref_distance_km = _greedy_route_reference(
+            *full, truck_capacity_kg, sh_idx, 4, 8.0, 0.0, 60.0
+        )
+        assert stops.tolist() == ref_stops
+        assert pigs.tolist() == ref_pigs
+        assert distance_km == pytest.approx(ref_distance_km, abs=1e-9)
+
+    np.testing.assert_array_equal(pruned[0], full[0])
+
+
+def test_haversine_asin_matches_atan2():
+    rng = np.random.default_rng(7)
+    lat1, lon1 = rng.uniform(-80, 80, 30), rng.uniform(-180, 180, 30)
+    lat2, lon2 = rng.uniform(-80, 80, 20), rng.uniform(-180, 180, 20)
+
+    phi1, phi2 = np.radians(lat1)[:, None], np.radians(lat2)[None, :]
+    dlam = np.radians(lon2)[None, :] - np.radians(lon1)[:, None]
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    expected = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    np.testing.assert_allclose(
+        haversine_matrix(lat1, lon1, lat2, lon2, dtype=np.float64), expected, rtol=1e-9
+    )
+
+
+def test_statistics_by_ages_matches_scalar(domain_objects):
+    bio_manager = domain_objects[3]
+    ages = np.linspace(-1.0, 40.0, 83)
+    batch = bio_manager.get_statistics_by_ages(ages)
+
+    for i, age in enumerate(ages):
+        scalar = bio_manager.get_statistics_by_age(age)
+        for key, value in scalar.items():
+            assert batch[key][i] == pytest.approx(value, abs=1e-9), key
+
+
+def test_interp_age_independent_of_hint():
+    ages = np.array([0.0, 1.0, 2.5, 4.0, 7.0, 10.0, 14.0, 18.0, 23.0, 26.0])
+    means = ages ** 1.5
+    sds = np.sqrt(ages + 1.0)
+
+    for age in np.linspace(-1.0, 27.0, 113):
+        expected = interp_age(ages, means, sds, age, 0)[:2]
+        for hint in range(-1, ages.size + 1):
+            assert interp_age(ages, means, sds, age, hint)[:2] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("mean, expected", [(110.0, 100.0), (105.0, 100.0), (90.0, 0.0)])
+def test_range_pct_without_spread(mean, expected):
+    # Con sd = 0 no hay normal: todo el lote está en `mean`.
+    assert range_pct(mean, 0.0, 105.0, 115.0) == expected
@@ -0,0 +1,146 @@
+"""
+Cada kernel `@njit` debe dar lo mismo compilado que en Python puro
+(`.py_func`), que es lo que se ejecuta cuando Numba no está instalado.
+"""
+
+import numpy as np
+import pytest
+
+from src.models.farm_kernels import can_deliver_today_batch, update_growth_batch
+from src.simulation.route_kernels import _grow, build_route_kernel, plan_day_kernel
+from src.utils.biological_kernels import interp_age, interp_ages_batch, range_pct
+
+# Sin Numba (o con NUMBA_DISABLE_JIT=1) los kernels ya son Python puro.
+pytestmark = pytest.mark.skipif(
+    not hasattr(update_growth_batch, "py_func"), reason="kernels sin compilar"
+)
+
+
+def _py(kernel):
+    """Versión en Python puro de un kernel compilado."""
+    return kernel.py_func
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(1234)
+
+
+@pytest.fixture
+def age_table():
+    """Tabla (edad, media, sd) ordenada por edad, con pasos irregulares."""
+    ages = np.array([0.0, 1.0, 2.5, 4.0, 7.0, 10.0, 14.0, 18.0, 23.0, 26.0])
+    means = np.linspace(5.0, 125.0, ages.size)
+    sds = np.linspace(0.5, 9.0, ages.size)
+    return ages, means, sds
+
+
+def _route_args(inst):
+    """Argumentos de `build_route_kernel` que salen de `route_instance`."""
+    return (
+        inst["remaining_pigs"], inst["remaining_cap_sh"], inst["weights"],
+        inst["ff_dist"], inst["fs_dist"], inst["ff_order"], inst["fs_order"],
+    )
+
+
+def _assert_same(a, b):
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        np.testing.assert_allclose(x, y, rtol=1e-12, atol=1e-12)
+
+
+def test_update_growth_batch(rng):
+    weights = rng.uniform(20.0, 110.0, 50)
+    ages = rng.uniform(5.0, 25.0, 50)
+    rates = rng.uniform(0.5, 1.2, 50)
+
+    compiled = (weights.copy(), ages.copy())
+    python = (weights.copy(), ages.copy())
+    update_growth_batch(*compiled, rates, 3)
+    _py(update_growth_batch)(*python, rates, 3)
+
+    _assert_same(compiled, python)
+
+
+def test_can_deliver_today_batch(rng):
+    inventory = rng.integers(-1, 3, 100).astype(np.int64)
+    last_week = rng.integers(-1, 3, 100).astype(np.int64)
+
+    for week in range(3):
+        np.testing.assert_array_equal(
+            can_deliver_today_batch(inventory, last_week, week),
+            _py(can_deliver_today_batch)(inventory, last_week, week),
+        )
+
+
+def test_grow():
+    arr = np.arange(5, dtype=np.int64)
+    compiled = _grow(arr)
+    python = _py(_grow)(arr)
+    assert compiled.shape == python.shape == (10,)
+    np.testing.assert_array_equal(compiled[:5], python[:5])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_build_route_kernel(route_instance, seed):
+    inst = route_instance(np.random.default_rng(seed))
+    compiled = {k: v.copy() for k, v in inst.items()}
+    python = {k: v.copy() for k, v in inst.items()}
+
+    for sh_idx in range(inst["remaining_cap_sh"].size):
+        _assert_same(
+            build_route_kernel(*_route_args(compiled), 20000.0, sh_idx, 3, 8.0, 0.5, 60.0),
+            _py(build_route_kernel)(*_route_args(python), 20000.0, sh_idx, 3, 8.0, 0.5, 60.0),
+        )
+
+    # Los estados que el kernel actualiza in-place también coinciden.
+    np.testing.assert_array_equal(compiled["remaining_pigs"], python["remaining_pigs"])
+    np.testing.assert_array_equal(compiled["remaining_cap_sh"], python["remaining_cap_sh"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_plan_day_kernel(route_instance, seed):
+    rng = np.random.default_rng(seed)
+    inst = route_instance(rng)
+    candidates = np.argsort(-inst["weights"], kind="stable").astype(np.int64)
+    tr_capacity_kg = rng.uniform(8000.0, 25000.0, 6)
+
+    def run(kernel):
+        d = {k: v.copy() for k, v in inst.items()}
+        out = kernel(
+            candidates, d["weights"], d["remaining_pigs"], d["remaining_cap_sh"],
+            tr_capacity_kg, d["ff_dist"], d["fs_dist"], d["ff_order"], d["fs_order"],
+            3, 8.0, 60.0,
+        )
+        return out + (d["remaining_pigs"], d["remaining_cap_sh"])
+
+    _assert_same(run(plan_day_kernel), run(_py(plan_day_kernel)))
+
+
+def test_interp_age(age_table):
+    queries = np.linspace(-2.0, 30.0, 257)
+    hint_c = hint_p = 0
+    for age in queries:
+        mean_c, sd_c, hint_c = interp_age(*age_table, age, hint_c)
+        mean_p, sd_p, hint_p = _py(interp_age)(*age_table, age, hint_p)
+        assert hint_c == hint_p
+        assert mean_c == pytest.approx(mean_p, abs=1e-12)
+        assert sd_c == pytest.approx(sd_p, abs=1e-12)
+
+
+def test_interp_ages_batch(age_table, rng):
+    queries = rng.uniform(-2.0, 30.0, 500)
+    _assert_same(
+        interp_ages_batch(*age_table, queries),
+        _py(interp_ages_batch)(*age_table, queries),
+    )
+
+
+@pytest.mark.parametrize(
+    "mean, sd",
+    [(110.0, 5.0), (95.0, 12.0), (130.0, 0.1), (110.0, 0.0), (90.0, 0.0)],
+)
+def test_range_pct(mean, sd):
+    assert range_pct(mean, sd, 105.0, 115.0) == pytest.approx(
+        _py(range_pct)(mean, sd, 105.0, 115.0), abs=1e-12
+    )
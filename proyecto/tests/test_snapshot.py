@@ -0,0 +1,48 @@
+"""
+`Simulator.snapshot` / `restore` deben devolver el sistema exactamente
+al punto guardado: repetir la simulación da los mismos eventos.
+"""
+
+import pandas as pd
+
+from src.simulation.Simulator import Simulator
+
+
+def _state(simulator):
+    """Estado mutable de todas las entidades, comparable con ==."""
+    return (
+        [farm.snapshot() for farm in simulator.farms],
+        [(sh.snapshot(), sh.daily_history.tolist()) for sh in simulator.slaughterhouses],
+        [transport.snapshot() for transport in simulator.transports],
+        [list(farm.weekly_inventory_history) for farm in simulator.farms],
+    )
+
+
+def test_restore_round_trip(domain_objects):
+    simulator = Simulator(*domain_objects)
+    snap = simulator.snapshot()
+    before = _state(simulator)
+
+    first = simulator.run(days=10)
+    assert not first.empty
+    assert _state(simulator) != before
+
+    simulator.restore(snap)
+    assert _state(simulator) == before
+
+    second = simulator.run(days=10)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_restore_rebuilds_arrays(domain_objects):
+    simulator = Simulator(*domain_objects)
+    snap = simulator.snapshot()
+    simulator.run(days=5)
+    simulator.restore(snap)
+
+    farm_arrays = simulator.farm_arrays
+    assert farm_arrays.inventory_pigs.tolist() == [f.inventory_pigs for f in simulator.farms]
+    assert farm_arrays.avg_weight_kg.tolist() == [f.avg_weight_kg for f in simulator.farms]
+    assert farm_arrays.last_delivery_week.tolist() == [
+        f.last_delivery_week for f in simulator.farms
+    ]
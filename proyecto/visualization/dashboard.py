@@ -2,7 +2,11 @@
 dashboard.py
 ============
 
-Funciones de visualización rápida usando Plotly.
+Funciones de visualización rápida usando Plotly (graph_objects, que se
+importa solo al dibujar).
+
+Todas las funciones aceptan los eventos o un `daily` ya calculado con
+`compute_daily_kpis`, para agrupar una sola vez y reutilizarlo.
 
 Incluye:
 - Cerdos entregados por día
@@ -15,116 +19,92 @@ from __future__ import annotations
 
 from typing import Optional
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
 
+from src.utils.metrics import compute_daily_kpis
 
-def plot_daily_pigs(events: pd.DataFrame):
-    """Bar chart de Cerdos entregados por día."""
+
+def _daily_frame(events: Optional[pd.DataFrame], daily: Optional[pd.DataFrame]):
+    """
+    Devuelve `daily` si ya viene calculado; si no, agrupa los eventos con
+    `compute_daily_kpis`. Retorna None (y avisa) si no hay nada que dibujar.
+    """
+    if daily is not None:
+        return daily
     if events is None or events.empty:
         print("No hay eventos para mostrar.")
-        return
+        return None
+    return compute_daily_kpis(events)
+
+
+def _show_daily_chart(daily: pd.DataFrame, column: str, title: str, y_label: str,
+                      line: bool = False):
+    """
+    Dibuja la columna `column` de `daily` por día, como barras o como
+    línea con marcadores, construyendo la figura directamente con
+    graph_objects.
+    """
+    import plotly.graph_objects as go
+
+    x = daily["day"].to_numpy()
+    y = daily[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    hovertemplate = f"Día=%{{x}}<br>{y_label}=%{{y}}<extra></extra>"
+
+    if line:
+        trace = go.Scatter(x=x, y=y, mode="lines+markers", hovertemplate=hovertemplate)
+    else:
+        trace = go.Bar(x=x, y=y, hovertemplate=hovertemplate)
+
+    fig = go.Figure(trace)
+    fig.update_layout(title=title, xaxis_title="Día", yaxis_title=y_label)
+    fig.show()
 
-    daily = (
-        events.groupby("day")["pigs_delivered"]
-        .sum()
-        .reset_index()
-        .rename(columns={"pigs_delivered": "pigs"})
-    )
 
-    fig = px.bar(
-        daily,
-        x="day",
-        y="pigs",
-        title="Cerdos entregados por día",
-        labels={"day": "Día", "pigs": "Cerdos entregados"},
-    )
-    fig.show()
+def plot_daily_pigs(events: Optional[pd.DataFrame] = None, daily: Optional[pd.DataFrame] = None):
+    """Bar chart de Cerdos entregados por día."""
+    daily = _daily_frame(events, daily)
+    if daily is None:
+        return
+
+    _show_daily_chart(daily, "pigs_delivered", "Cerdos entregados por día", "Cerdos entregados")
 
 
-def plot_daily_profit(events: pd.DataFrame):
+def plot_daily_profit(events: Optional[pd.DataFrame] = None, daily: Optional[pd.DataFrame] = None):
     """Beneficio neto por día."""
-    if events is None or events.empty:
-        print("No hay eventos para mostrar.")
+    daily = _daily_frame(events, daily)
+    if daily is None:
         return
 
-    if "revenue" not in events.columns or "transport_cost" not in events.columns:
+    if "net_profit" not in daily.columns:
         print("Faltan columnas 'revenue' o 'transport_cost' en los eventos.")
         return
 
-    daily = (
-        events.groupby("day")
-        .agg(
-            revenue=("revenue", "sum"),
-            transport_cost=("transport_cost", "sum"),
-        )
-        .reset_index()
-    )
-    daily["net_profit"] = daily["revenue"] - daily["transport_cost"]
-
-    fig = px.bar(
-        daily,
-        x="day",
-        y="net_profit",
-        title="Beneficio neto por día",
-        labels={"day": "Día", "net_profit": "Beneficio neto (€)"},
-    )
-    fig.show()
+    _show_daily_chart(daily, "net_profit", "Beneficio neto por día", "Beneficio neto (€)")
 
 
-def plot_avg_pigs_per_route(events: pd.DataFrame):
+def plot_avg_pigs_per_route(events: Optional[pd.DataFrame] = None, daily: Optional[pd.DataFrame] = None):
     """Cerdos medios por ruta y día."""
-    if events is None or events.empty:
-        print("No hay eventos para mostrar.")
+    daily = _daily_frame(events, daily)
+    if daily is None:
         return
 
-    daily = (
-        events.groupby("day")
-        .agg(
-            pigs_delivered=("pigs_delivered", "sum"),
-            routes=("route_id", "nunique"),
-        )
-        .reset_index()
+    _show_daily_chart(
+        daily, "avg_pigs_per_route", "Cerdos medios por ruta y día", "Cerdos / ruta", line=True
     )
-    daily["avg_pigs_per_route"] = daily["pigs_delivered"] / daily["routes"].replace(0, pd.NA)
-
-    fig = px.line(
-        daily,
-        x="day",
-        y="avg_pigs_per_route",
-        markers=True,
-        title="Cerdos medios por ruta y día",
-        labels={"day": "Día", "avg_pigs_per_route": "Cerdos / ruta"},
-    )
-    fig.show()
 
 
-def plot_avg_distance_per_route(events: pd.DataFrame):
+def plot_avg_distance_per_route(events: Optional[pd.DataFrame] = None, daily: Optional[pd.DataFrame] = None):
     """Distancia media por ruta y día."""
-    if events is None or events.empty:
-        print("No hay eventos para mostrar.")
+    daily = _daily_frame(events, daily)
+    if daily is None:
         return
 
-    if "distance_km" not in events.columns or "route_id" not in events.columns:
+    if "avg_distance_per_route_km" not in daily.columns:
         print("Faltan columnas 'distance_km' o 'route_id' en los eventos.")
         return
 
-    daily = (
-        events.groupby("day")
-        .agg(
-            distance_km=("distance_km", "sum"),
-            routes=("route_id", "nunique"),
-        )
-        .reset_index()
-    )
-    daily["avg_distance_per_route_km"] = daily["distance_km"] / daily["routes"].replace(0, pd.NA)
-
-    fig = px.line(
-        daily,
-        x="day",
-        y="avg_distance_per_route_km",
-        markers=True,
-        title="Distancia media por ruta y día",
-        labels={"day": "Día", "avg_distance_per_route_km": "km / ruta"},
+    _show_daily_chart(
+        daily, "avg_distance_per_route_km", "Distancia media por ruta y día", "km / ruta",
+        line=True,
     )
-    fig.show()
@@ -4,15 +4,19 @@ map.py
 
 Mapa sencillo de granjas y mataderos usando Plotly.
 
+- build_site_lookup: tablas de granjas y mataderos reutilizables.
 - plot_infrastructure_map: solo puntos.
 - plot_routes_for_day: puntos + líneas de rutas para un día concreto.
 """
 
 from __future__ import annotations
 
-from typing import List
-import ast
+from itertools import chain
+from typing import List, Optional, Tuple
+import math
+import re
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 
@@ -20,40 +24,72 @@ from src.models.Farm import Farm
 from src.models.Slaughterhouse import Slaughterhouse
 
 
-def plot_infrastructure_map(farms: List[Farm], slaughterhouses: List[Slaughterhouse]):
+def build_site_lookup(
+    farms: List[Farm], slaughterhouses: List[Slaughterhouse]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Tablas (farm_df, sh_df) con ID, coordenadas y nombre de cada granja y
+    matadero, para calcularlas una vez y pasarlas como `lookup` a las
+    funciones de este módulo. Con IDs repetidos se queda el último.
+    """
+    n_farms, n_sh = len(farms), len(slaughterhouses)
+    farm_df = pd.DataFrame(
+        {
+            "farm_id": [f.farm_id for f in farms],
+            "lat": np.fromiter((f.lat for f in farms), dtype=np.float64, count=n_farms),
+            "lon": np.fromiter((f.lon for f in farms), dtype=np.float64, count=n_farms),
+            "name": [f.name for f in farms],
+        }
+    ).drop_duplicates("farm_id", keep="last")
+    sh_df = pd.DataFrame(
+        {
+            "slaughterhouse_id": [s.slaughterhouse_id for s in slaughterhouses],
+            "lat": np.fromiter((s.lat for s in slaughterhouses), dtype=np.float64, count=n_sh),
+            "lon": np.fromiter((s.lon for s in slaughterhouses), dtype=np.float64, count=n_sh),
+            "name": [s.name for s in slaughterhouses],
+        }
+    ).drop_duplicates("slaughterhouse_id", keep="last")
+    return farm_df, sh_df
+
+
+def plot_infrastructure_map(
+    farms: List[Farm],
+    slaughterhouses: List[Slaughterhouse],
+    lookup: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None,
+):
     """
     Dibuja la localización de granjas y mataderos en un mapa.
 
     En el contexto de los datos del reto, debería dibujar Cataluña.
+    `lookup` es el resultado de `build_site_lookup`, si ya se tiene.
     """
     if not farms and not slaughterhouses:
         print("No hay granjas ni mataderos para mostrar.")
         return
 
-    rows = []
-
-    for f in farms:
-        rows.append(
-            {
-                "name": f.name,
-                "lat": f.lat,
-                "lon": f.lon,
-                "type": "Granja",
-            }
+    if lookup is not None:
+        farm_df, sh_df = lookup
+        columns = ["name", "lat", "lon"]
+        df = pd.concat(
+            [
+                farm_df[columns].assign(type="Granja"),
+                sh_df[columns].assign(type="Mataderos"),
+            ],
+            ignore_index=True,
         )
-
-    for s in slaughterhouses:
-        rows.append(
+    else:
+        # Columnas construidas directamente: granjas primero, luego mataderos.
+        sites = list(chain(farms, slaughterhouses))
+        n_sites = len(sites)
+        df = pd.DataFrame(
             {
-                "name": s.name,
-                "lat": s.lat,
-                "lon": s.lon,
-                "type": "Mataderos",
+                "name": [site.name for site in sites],
+                "lat": np.fromiter((site.lat for site in sites), dtype=np.float64, count=n_sites),
+                "lon": np.fromiter((site.lon for site in sites), dtype=np.float64, count=n_sites),
+                "type": np.repeat(["Granja", "Mataderos"], [len(farms), len(slaughterhouses)]),
             }
         )
 
-    df = pd.DataFrame(rows)
-
     fig = px.scatter_geo(
         df,
         lat="lat",
@@ -66,22 +102,18 @@ def plot_infrastructure_map(farms: List[Farm], slaughterhouses: List[Slaughterho
     fig.show()
 
 
+# Un ID por token: todo lo que no sea corchete, comilla, coma o espacio.
+# Cubre tanto "['F1', 'F2']" (repr de lista) como "F1, F2".
+_FARM_ID_RE = re.compile(r"[^\s\[\]'\",]+")
+
+
 def _parse_farms_visited(value):
     """Convierte el campo farms_visited de cada evento a lista de IDs."""
     if isinstance(value, list):
         return value
-    if value is None:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
         return []
-    s = str(value)
-    try:
-        # Intentar parsear como lista Python: "['F1', 'F2']"
-        parsed = ast.literal_eval(s)
-        if isinstance(parsed, list):
-            return parsed
-    except Exception:
-        pass
-    # Fallback: separar por coma
-    return [x.strip() for x in s.split(",") if x.strip()]
+    return _FARM_ID_RE.findall(str(value))
 
 
 def plot_routes_for_day(
@@ -89,6 +121,7 @@ def plot_routes_for_day(
     farms: List[Farm],
     slaughterhouses: List[Slaughterhouse],
     day: int,
+    lookup: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None,
 ):
     """
     Dibuja las rutas ejecutadas en un día concreto.
@@ -96,6 +129,8 @@ def plot_routes_for_day(
     - Cada ruta se dibuja como una polilínea:
       mataderos -> granja1 -> granja2 -> ... -> mataderos
     - Colorea por route_id.
+    - `lookup` (de `build_site_lookup`) evita reconstruir las tablas de
+      granjas y mataderos en cada llamada.
     """
     if events is None or events.empty:
         print("No hay eventos para mostrar.")
@@ -106,46 +141,66 @@ def plot_routes_for_day(
         print(f"No hay rutas para el día {day}.")
         return
 
-    farm_dict = {f.farm_id: f for f in farms}
-    sh_dict = {s.slaughterhouse_id: s for s in slaughterhouses}
-
-    rows = []
-
-    for _, row in day_events.iterrows():
-        route_id = row.get("route_id", f"day{day}_r{row.get('route_index', 0)}")
-        sh_id = row["slaughterhouse_id"]
-        sh = sh_dict.get(sh_id)
-        if sh is None:
-            continue
-
-        farms_visited = _parse_farms_visited(row.get("farms_visited"))
-
-        points = [("matadeors", sh.lat, sh.lon, sh.name)]
-
-        for farm_id in farms_visited:
-            farm = farm_dict.get(farm_id)
-            if farm is not None:
-                points.append(("Granja", farm.lat, farm.lon, farm.name))
-
-        points.append(("Mataderos", sh.lat, sh.lon, sh.name))
+    farm_df, sh_df = lookup if lookup is not None else build_site_lookup(farms, slaughterhouses)
+
+    if "route_id" in day_events.columns:
+        route_ids = day_events["route_id"]
+    else:
+        route_index = day_events.get("route_index", 0)
+        route_ids = f"day{day}_r" + pd.Series(route_index, index=day_events.index).astype(str)
+
+    # Los eventos cargados de CSV repiten mucho las mismas cadenas.
+    parsed_cache = {}
+
+    def parse(value):
+        if not isinstance(value, str):
+            return _parse_farms_visited(value)
+        ids = parsed_cache.get(value)
+        if ids is None:
+            ids = parsed_cache[value] = _parse_farms_visited(value)
+        return ids
+
+    # Una fila por ruta con su escorxador; las rutas a escorxadores
+    # desconocidos se descartan. `_route` conserva el orden de los eventos.
+    routes = pd.DataFrame(
+        {
+            "route_id": route_ids.to_numpy(),
+            "slaughterhouse_id": day_events["slaughterhouse_id"].to_numpy(),
+            "farms_visited": day_events["farms_visited"].map(parse).to_numpy(),
+        }
+    )
+    routes["_route"] = range(len(routes))
+    routes = routes.merge(sh_df, on="slaughterhouse_id", how="inner").sort_values(
+        "_route", kind="stable"
+    )
 
-        for idx, (ptype, lat, lon, name) in enumerate(points):
-            rows.append(
-                {
-                    "route_id": route_id,
-                    "step": idx,
-                    "type": ptype,
-                    "lat": lat,
-                    "lon": lon,
-                    "name": name,
-                }
-            )
+    # Una fila por granja visitada, en el orden de la ruta.
+    stops = (
+        routes[["_route", "route_id", "farms_visited"]]
+        .explode("farms_visited")
+        .rename(columns={"farms_visited": "farm_id"})
+        .merge(farm_df, on="farm_id", how="inner", sort=False)
+        .assign(type="Granja")
+    )
 
-    if not rows:
+    columns = ["_route", "route_id", "type", "lat", "lon", "name"]
+    # Concatenación escorxador -> granjas -> escorxador; la ordenación estable
+    # por `_route` mantiene ese orden dentro de cada ruta.
+    df = pd.concat(
+        [
+            routes.assign(type="matadeors")[columns],
+            stops[columns],
+            routes.assign(type="Mataderos")[columns],
+        ],
+        ignore_index=True,
+    ).sort_values("_route", kind="stable")
+
+    if df.empty:
         print(f"No se pudieron construir segmentos de ruta para el día {day}.")
         return
 
-    df = pd.DataFrame(rows)
+    df.insert(1, "step", df.groupby("_route").cumcount())
+    df = df.drop(columns="_route").reset_index(drop=True)
 
     fig = px.line_geo(
         df,